@@ -0,0 +1,24 @@
+"""Anthropic client shared by the cognition engines."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+# The SDK takes ~1 s to import, so it is loaded on first client creation
+# rather than with the engines. Tests patch this attribute directly.
+anthropic = None
+
+
+@lru_cache(maxsize=8)
+def get_client(api_key: str):
+    """Return the client for *api_key*, creating it on first use.
+
+    One client (and HTTP connection pool) per API key is shared by every
+    HaikuEngine and SonnetEngine, so a restarted SoulLoop reuses warm
+    connections.
+    """
+    global anthropic
+    if anthropic is None:
+        import anthropic
+    return anthropic.Anthropic(api_key=api_key)
@@ -19,16 +19,12 @@ Routing rules:
 
 from __future__ import annotations
 
-import logging
 from datetime import datetime
+import logging
 from typing import TYPE_CHECKING
 
 from soul.cognition.haiku import HaikuEngine
-from soul.cognition.prompt import (
-    build_acknowledge_prompt,
-    build_haiku_prompt,
-    build_sonnet_prompt,
-)
+from soul.cognition.prompt import build_acknowledge_prompt, build_haiku_prompt, build_sonnet_prompt
 from soul.cognition.router import classify
 from soul.cognition.schemas import (
     Action,
@@ -40,6 +36,7 @@ from soul.cognition.schemas import (
 )
 from soul.cognition.sonnet import SonnetEngine
 
+
 if TYPE_CHECKING:
     from soul.config import SoulConfig
     from soul.memory.facility import FacilityManager
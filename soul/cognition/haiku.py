@@ -9,7 +9,8 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-import anthropic
+from soul.cognition._client import get_client
+
 
 if TYPE_CHECKING:
     from soul.config import SoulConfig
@@ -27,9 +28,7 @@ class HaikuEngine:
     def _get_client(self):
         """Lazy-init the Anthropic client."""
         if self._client is None:
-            self._client = anthropic.Anthropic(
-                api_key=self._config.anthropic_api_key,
-            )
+            self._client = get_client(self._config.anthropic_api_key)
         return self._client
 
     @staticmethod
@@ -10,6 +10,7 @@ Templates use .format() with these placeholders:
 
 from __future__ import annotations
 
+
 # ---------------------------------------------------------------------------
 # Haiku — warm, brief, natural conversation
 # ---------------------------------------------------------------------------
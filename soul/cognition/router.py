@@ -6,7 +6,9 @@ When in doubt, routes to complex_plan (Sonnet) so the heavier model can decide.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 import re
+
 from soul.cognition.schemas import Intent, IntentCategory
 
 
@@ -93,19 +95,71 @@ _SIMPLE_CHAT_PATTERNS = [
 ]
 
 
+
+# ---------------------------------------------------------------------------
+# Compiled matchers — one regex per category, built once at import
+# ---------------------------------------------------------------------------
+
+def _keywords_re(keywords: set[str]) -> re.Pattern[str]:
+    """Substring match for any keyword (same semantics as ``kw in text``).
+
+    Longer keywords come first so the reported match is the most specific
+    one at a given position.
+    """
+    ordered = sorted(keywords, key=lambda kw: (-len(kw), kw))
+    return re.compile("|".join(re.escape(kw) for kw in ordered))
+
+
+def _patterns_re(patterns: list[str]) -> re.Pattern[str]:
+    """Match if any of *patterns* matches (same as searching each in turn)."""
+    return re.compile("|".join(f"(?:{pat})" for pat in patterns))
+
+
+_EMERGENCY_RE = _keywords_re(_EMERGENCY_KEYWORDS)
+_GREETING_RE = _patterns_re(_GREETING_PATTERNS)
+_FAREWELL_RE = _patterns_re(_FAREWELL_PATTERNS)
+_NAVIGATE_RE = _keywords_re(_NAVIGATE_KEYWORDS)
+_ITEM_RE = re.compile(
+    f"{_keywords_re(_ITEM_KEYWORDS).pattern}|{_patterns_re(_ITEM_PATTERNS).pattern}"
+)
+_PREFERENCE_RE = _patterns_re(_PREFERENCE_PATTERNS)
+_INFORMATION_RE = _patterns_re(_INFORMATION_PATTERNS)
+_HELP_RE = _keywords_re(_HELP_KEYWORDS)
+_SIMPLE_CHAT_RE = _patterns_re(_SIMPLE_CHAT_PATTERNS)
+
+
 # ---------------------------------------------------------------------------
 # Entity extraction helpers
 # ---------------------------------------------------------------------------
 
-def _extract_item(text: str) -> str | None:
-    """Try to extract an item name from a request."""
-    patterns = [
+_ITEM_ENTITY_RES = [
+    re.compile(pat, re.IGNORECASE)
+    for pat in (
         r"(?:bring|fetch|get|grab|hand|pass|give)\s+(?:me\s+)?(?:my\s+)?(?:a\s+)?(?:the\s+)?(.+?)(?:\s+please|\s*[\.!\?]?\s*$)",
         r"(?:i\s+need|i\s+want|could\s+i\s+have|can\s+i\s+have|may\s+i\s+have)\s+(?:my\s+)?(?:a\s+)?(?:the\s+)?(.+?)(?:\s+please|\s*[\.!\?]?\s*$)",
         r"(?:find|where\s+is|where\s+are)\s+(?:my\s+)?(?:the\s+)?(.+?)(?:\s*[\.!\?]?\s*$)",
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
+    )
+]
+
+_LOCATION_ENTITY_RES = [
+    re.compile(pat, re.IGNORECASE)
+    for pat in (
+        r"(?:go\s+to|take\s+me\s+to|bring\s+me\s+to|walk\s+me\s+to|navigate\s+to|escort\s+me\s+to|lead\s+me\s+to)\s+(?:the\s+)?(.+?)(?:\s+please|\s*[\.!\?]?\s*$)",
+        r"(?:where\s+is|how\s+do\s+i\s+get\s+to)\s+(?:the\s+)?(.+?)(?:\s*[\.!\?]?\s*$)",
+        r"(?:return\s+to|go\s+back\s+to|walk\s+to|move\s+to)\s+(?:the\s+)?(.+?)(?:\s+please|\s*[\.!\?]?\s*$)",
+    )
+]
+
+_PERSON_ENTITY_RE = re.compile(r"(?:tell|ask|call|find|see|visit|talk\s+to)\s+(\w+)", re.IGNORECASE)
+
+# Words the person pattern captures that are never names
+_NON_NAMES = frozenset({"me", "us", "them", "her", "him", "it", "the", "a", "an", "my"})
+
+
+def _extract_item(text: str) -> str | None:
+    """Try to extract an item name from a request."""
+    for pat in _ITEM_ENTITY_RES:
+        m = pat.search(text)
         if m:
             item = m.group(1).strip().rstrip(".,!?")
             if item and len(item) < 60:
@@ -115,13 +169,8 @@ def _extract_item(text: str) -> str | None:
 
 def _extract_location(text: str) -> str | None:
     """Try to extract a location/destination from a request."""
-    patterns = [
-        r"(?:go\s+to|take\s+me\s+to|bring\s+me\s+to|walk\s+me\s+to|navigate\s+to|escort\s+me\s+to|lead\s+me\s+to)\s+(?:the\s+)?(.+?)(?:\s+please|\s*[\.!\?]?\s*$)",
-        r"(?:where\s+is|how\s+do\s+i\s+get\s+to)\s+(?:the\s+)?(.+?)(?:\s*[\.!\?]?\s*$)",
-        r"(?:return\s+to|go\s+back\s+to|walk\s+to|move\s+to)\s+(?:the\s+)?(.+?)(?:\s+please|\s*[\.!\?]?\s*$)",
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
+    for pat in _LOCATION_ENTITY_RES:
+        m = pat.search(text)
         if m:
             loc = m.group(1).strip().rstrip(".,!?")
             if loc and len(loc) < 60:
@@ -131,16 +180,11 @@ def _extract_location(text: str) -> str | None:
 
 def _extract_person(text: str) -> str | None:
     """Try to extract a person name from a request."""
-    patterns = [
-        r"(?:tell|ask|call|find|see|visit|talk\s+to)\s+(\w+)",
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
-        if m:
-            name = m.group(1).strip()
-            # Filter out common non-names
-            if name.lower() not in {"me", "us", "them", "her", "him", "it", "the", "a", "an", "my"}:
-                return name
+    m = _PERSON_ENTITY_RE.search(text)
+    if m:
+        name = m.group(1).strip()
+        if name.lower() not in _NON_NAMES:
+            return name
     return None
 
 
@@ -166,60 +210,47 @@ def classify(text: str) -> Intent:
     entities: dict[str, str] = {}
 
     # ---- 1. Emergency (highest priority) ----
-    for kw in _EMERGENCY_KEYWORDS:
-        if kw in lower:
-            return Intent(
-                category=IntentCategory.EMERGENCY,
-                confidence=0.95,
-                entities={"trigger": kw},
-                raw_text=text,
-            )
+    m = _EMERGENCY_RE.search(lower)
+    if m:
+        return Intent(
+            category=IntentCategory.EMERGENCY,
+            confidence=0.95,
+            entities={"trigger": m.group()},
+            raw_text=text,
+        )
 
     # ---- 2. Greeting ----
-    for pat in _GREETING_PATTERNS:
-        if re.search(pat, lower):
-            return Intent(
-                category=IntentCategory.GREETING,
-                confidence=0.9,
-                entities={},
-                raw_text=text,
-            )
+    if _GREETING_RE.search(lower):
+        return Intent(
+            category=IntentCategory.GREETING,
+            confidence=0.9,
+            entities={},
+            raw_text=text,
+        )
 
     # ---- 3. Farewell ----
-    for pat in _FAREWELL_PATTERNS:
-        if re.search(pat, lower):
-            return Intent(
-                category=IntentCategory.FAREWELL,
-                confidence=0.9,
-                entities={},
-                raw_text=text,
-            )
+    if _FAREWELL_RE.search(lower):
+        return Intent(
+            category=IntentCategory.FAREWELL,
+            confidence=0.9,
+            entities={},
+            raw_text=text,
+        )
 
     # ---- 4. Navigation requests ----
-    for kw in _NAVIGATE_KEYWORDS:
-        if kw in lower:
-            loc = _extract_location(text)
-            if loc:
-                entities["location"] = loc
-            return Intent(
-                category=IntentCategory.REQUEST_NAVIGATE,
-                confidence=0.85,
-                entities=entities,
-                raw_text=text,
-            )
+    if _NAVIGATE_RE.search(lower):
+        loc = _extract_location(text)
+        if loc:
+            entities["location"] = loc
+        return Intent(
+            category=IntentCategory.REQUEST_NAVIGATE,
+            confidence=0.85,
+            entities=entities,
+            raw_text=text,
+        )
 
     # ---- 5. Item requests ----
-    item_match = False
-    for kw in _ITEM_KEYWORDS:
-        if kw in lower:
-            item_match = True
-            break
-    if not item_match:
-        for pat in _ITEM_PATTERNS:
-            if re.search(pat, lower):
-                item_match = True
-                break
-    if item_match:
+    if _ITEM_RE.search(lower):
         item = _extract_item(text)
         if item:
             entities["item"] = item
@@ -231,44 +262,40 @@ def classify(text: str) -> Intent:
         )
 
     # ---- 6. Preferences ----
-    for pat in _PREFERENCE_PATTERNS:
-        if re.search(pat, lower):
-            return Intent(
-                category=IntentCategory.PREFERENCE,
-                confidence=0.8,
-                entities={},
-                raw_text=text,
-            )
+    if _PREFERENCE_RE.search(lower):
+        return Intent(
+            category=IntentCategory.PREFERENCE,
+            confidence=0.8,
+            entities={},
+            raw_text=text,
+        )
 
     # ---- 7. Information requests ----
-    for pat in _INFORMATION_PATTERNS:
-        if re.search(pat, lower):
-            return Intent(
-                category=IntentCategory.INFORMATION,
-                confidence=0.8,
-                entities={},
-                raw_text=text,
-            )
+    if _INFORMATION_RE.search(lower):
+        return Intent(
+            category=IntentCategory.INFORMATION,
+            confidence=0.8,
+            entities={},
+            raw_text=text,
+        )
 
     # ---- 8. Help requests ----
-    for kw in _HELP_KEYWORDS:
-        if kw in lower:
-            return Intent(
-                category=IntentCategory.REQUEST_HELP,
-                confidence=0.75,
-                entities={},
-                raw_text=text,
-            )
+    if _HELP_RE.search(lower):
+        return Intent(
+            category=IntentCategory.REQUEST_HELP,
+            confidence=0.75,
+            entities={},
+            raw_text=text,
+        )
 
     # ---- 9. Simple chat ----
-    for pat in _SIMPLE_CHAT_PATTERNS:
-        if re.search(pat, lower):
-            return Intent(
-                category=IntentCategory.SIMPLE_CHAT,
-                confidence=0.7,
-                entities={},
-                raw_text=text,
-            )
+    if _SIMPLE_CHAT_RE.search(lower):
+        return Intent(
+            category=IntentCategory.SIMPLE_CHAT,
+            confidence=0.7,
+            entities={},
+            raw_text=text,
+        )
 
     # ---- 10. Default: complex_plan (let Sonnet decide) ----
     person = _extract_person(text)
@@ -281,3 +308,8 @@ def classify(text: str) -> Intent:
         entities=entities,
         raw_text=text,
     )
+
+
+def classify_many(texts: Iterable[str]) -> list[Intent]:
+    """Classify a batch of utterances (e.g. a drained message queue), in order."""
+    return [classify(text) for text in texts]
@@ -12,16 +12,20 @@ import logging
 import re
 from typing import TYPE_CHECKING
 
-import anthropic
-
+from soul.cognition._client import get_client
 from soul.cognition.schemas import ActionPlan
 
+
 if TYPE_CHECKING:
     from soul.config import SoulConfig
 
 logger = logging.getLogger(__name__)
 
 
+_FENCE = "```"
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?\s*```", re.DOTALL)
+
+
 def _extract_json(text: str) -> str:
     """Extract JSON from text that may be wrapped in markdown code blocks.
 
@@ -30,8 +34,10 @@ def _extract_json(text: str) -> str:
     - ```json ... ```
     - ``` ... ```
     """
-    # Try to find JSON in a code block first
-    match = re.search(r"```(?:json)?\s*\n?(.*?)\n?\s*```", text, re.DOTALL)
+    # Most responses are bare JSON — skip the regex when there's no fence
+    if _FENCE not in text:
+        return text.strip()
+    match = _FENCE_RE.search(text)
     if match:
         return match.group(1).strip()
     # Otherwise return the text as-is (assume it's raw JSON)
@@ -48,9 +54,7 @@ class SonnetEngine:
     def _get_client(self):
         """Lazy-init the Anthropic client."""
         if self._client is None:
-            self._client = anthropic.Anthropic(
-                api_key=self._config.anthropic_api_key,
-            )
+            self._client = get_client(self._config.anthropic_api_key)
         return self._client
 
     def plan(self, text: str, system_prompt: str) -> ActionPlan:
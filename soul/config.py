@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 import os
-from dataclasses import dataclass, field
+import re
 
 
 @dataclass
@@ -53,48 +55,92 @@ class SoulConfig:
 
     @classmethod
     def from_env(cls) -> SoulConfig:
-        """Load config from SOUL_* environment variables."""
-
-        def _env(key: str, default: str = "") -> str:
-            return os.environ.get(f"SOUL_{key}", default)
-
-        def _bool(key: str, default: bool = False) -> bool:
-            val = _env(key, str(default)).lower()
-            return val in ("true", "1", "yes")
-
-        def _int(key: str, default: int = 0) -> int:
-            try:
-                return int(_env(key, str(default)))
-            except ValueError:
-                return default
-
-        def _float(key: str, default: float = 0.0) -> float:
-            try:
-                return float(_env(key, str(default)))
-            except ValueError:
-                return default
-
-        return cls(
-            anthropic_api_key=_env("ANTHROPIC_API_KEY") or os.environ.get("ANTHROPIC_API_KEY", ""),
-            haiku_model=_env("HAIKU_MODEL", cls.haiku_model),
-            sonnet_model=_env("SONNET_MODEL", cls.sonnet_model),
-            haiku_max_tokens=_int("HAIKU_MAX_TOKENS", cls.haiku_max_tokens),
-            sonnet_max_tokens=_int("SONNET_MAX_TOKENS", cls.sonnet_max_tokens),
-            stt_enabled=_bool("STT_ENABLED", cls.stt_enabled),
-            whisper_model=_env("WHISPER_MODEL", cls.whisper_model),
-            whisper_device=_env("WHISPER_DEVICE", cls.whisper_device),
-            tts_provider=_env("TTS_PROVIDER", cls.tts_provider),
-            elevenlabs_api_key=_env("ELEVENLABS_API_KEY"),
-            elevenlabs_voice_id=_env("ELEVENLABS_VOICE_ID", cls.elevenlabs_voice_id),
-            tts_rate=_int("TTS_RATE", cls.tts_rate),
-            groot_host=_env("GROOT_HOST", cls.groot_host),
-            groot_port=_int("GROOT_PORT", cls.groot_port),
-            groot_enabled=_bool("GROOT_ENABLED", cls.groot_enabled),
-            speaker_id_enabled=_bool("SPEAKER_ID_ENABLED", cls.speaker_id_enabled),
-            speaker_id_threshold=_float("SPEAKER_ID_THRESHOLD", cls.speaker_id_threshold),
-            db_path=_env("DB_PATH"),
-            facility_name=_env("FACILITY_NAME", cls.facility_name),
-            silence_timeout=_float("SILENCE_TIMEOUT", cls.silence_timeout),
-            interim_response=_bool("INTERIM_RESPONSE", cls.interim_response),
-            robot_name=_env("ROBOT_NAME", cls.robot_name),
-        )
+        """Load config from SOUL_* environment variables.
+
+        Parsing is memoized on the values of the variables read, so repeated
+        calls against an unchanged environment skip the conversions.
+        """
+        snapshot = tuple(os.environ.get(f"SOUL_{key}") for key in _ENV_KEYS)
+        return cls(**_parse_env(cls, snapshot, os.environ.get("ANTHROPIC_API_KEY", "")))
+
+
+# Every SOUL_* variable from_env() reads; the cache key is their values
+_ENV_KEYS = (
+    "ANTHROPIC_API_KEY",
+    "HAIKU_MODEL",
+    "SONNET_MODEL",
+    "HAIKU_MAX_TOKENS",
+    "SONNET_MAX_TOKENS",
+    "STT_ENABLED",
+    "WHISPER_MODEL",
+    "WHISPER_DEVICE",
+    "TTS_PROVIDER",
+    "ELEVENLABS_API_KEY",
+    "ELEVENLABS_VOICE_ID",
+    "TTS_RATE",
+    "GROOT_HOST",
+    "GROOT_PORT",
+    "GROOT_ENABLED",
+    "SPEAKER_ID_ENABLED",
+    "SPEAKER_ID_THRESHOLD",
+    "DB_PATH",
+    "FACILITY_NAME",
+    "SILENCE_TIMEOUT",
+    "INTERIM_RESPONSE",
+    "ROBOT_NAME",
+)
+
+
+# Pre-checks for int()/float() so malformed values fall back to the default
+# without raising (and building) a ValueError
+_INT_RE = re.compile(r"\s*[+-]?\d+\s*\Z")
+_FLOAT_RE = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*\Z")
+
+
+@lru_cache(maxsize=32)
+def _parse_env(
+    cls: type[SoulConfig], snapshot: tuple[str | None, ...], fallback_api_key: str
+) -> dict:
+    """Convert a snapshot of the _ENV_KEYS values into SoulConfig kwargs."""
+    values = dict(zip(_ENV_KEYS, snapshot))
+
+    def _env(key: str, default: str = "") -> str:
+        val = values[key]
+        return default if val is None else val
+
+    def _bool(key: str, default: bool = False) -> bool:
+        val = _env(key, str(default)).lower()
+        return val in ("true", "1", "yes")
+
+    def _int(key: str, default: int = 0) -> int:
+        val = _env(key, str(default))
+        return int(val) if _INT_RE.match(val) else default
+
+    def _float(key: str, default: float = 0.0) -> float:
+        val = _env(key, str(default))
+        return float(val) if _FLOAT_RE.match(val) else default
+
+    return dict(
+        anthropic_api_key=_env("ANTHROPIC_API_KEY") or fallback_api_key,
+        haiku_model=_env("HAIKU_MODEL", cls.haiku_model),
+        sonnet_model=_env("SONNET_MODEL", cls.sonnet_model),
+        haiku_max_tokens=_int("HAIKU_MAX_TOKENS", cls.haiku_max_tokens),
+        sonnet_max_tokens=_int("SONNET_MAX_TOKENS", cls.sonnet_max_tokens),
+        stt_enabled=_bool("STT_ENABLED", cls.stt_enabled),
+        whisper_model=_env("WHISPER_MODEL", cls.whisper_model),
+        whisper_device=_env("WHISPER_DEVICE", cls.whisper_device),
+        tts_provider=_env("TTS_PROVIDER", cls.tts_provider),
+        elevenlabs_api_key=_env("ELEVENLABS_API_KEY"),
+        elevenlabs_voice_id=_env("ELEVENLABS_VOICE_ID", cls.elevenlabs_voice_id),
+        tts_rate=_int("TTS_RATE", cls.tts_rate),
+        groot_host=_env("GROOT_HOST", cls.groot_host),
+        groot_port=_int("GROOT_PORT", cls.groot_port),
+        groot_enabled=_bool("GROOT_ENABLED", cls.groot_enabled),
+        speaker_id_enabled=_bool("SPEAKER_ID_ENABLED", cls.speaker_id_enabled),
+        speaker_id_threshold=_float("SPEAKER_ID_THRESHOLD", cls.speaker_id_threshold),
+        db_path=_env("DB_PATH"),
+        facility_name=_env("FACILITY_NAME", cls.facility_name),
+        silence_timeout=_float("SILENCE_TIMEOUT", cls.silence_timeout),
+        interim_response=_bool("INTERIM_RESPONSE", cls.interim_response),
+        robot_name=_env("ROBOT_NAME", cls.robot_name),
+    )
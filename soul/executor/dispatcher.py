@@ -7,13 +7,15 @@ built-in handlers for WAIT / ALERT_STAFF / REMEMBER / QUERY_MEMORY).
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 import logging
 import time
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 from soul.cognition.schemas import Action, ActionPlan, ActionType
 
+
 if TYPE_CHECKING:
     from soul.executor.manipulate import Manipulator
     from soul.executor.navigate import Navigator
@@ -33,6 +35,53 @@ class ActionResult:
     error: str | None = None
 
 
+@lru_cache(maxsize=64)
+def _topo_order(
+    depends_on: tuple[tuple[int, ...], ...],
+) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Kahn's algorithm over per-action dependency indices (see _resolve_order).
+
+    Returns ``(order, cyclic)``: *cyclic* lists the indices left over by a
+    dependency cycle (already appended to *order*). Nothing is logged here,
+    since cache hits would skip it; the caller warns.
+    """
+    n = len(depends_on)
+    if n == 0:
+        return (), ()
+
+    # Build in-degree map
+    in_degree: dict[int, int] = {i: 0 for i in range(n)}
+    dependents: dict[int, list[int]] = {i: [] for i in range(n)}
+
+    for i, deps in enumerate(depends_on):
+        for dep in deps:
+            if 0 <= dep < n:
+                in_degree[i] += 1
+                dependents[dep].append(i)
+
+    # Kahn's algorithm — use sorted() to preserve original order among
+    # actions with equal readiness.
+    queue = sorted(i for i in range(n) if in_degree[i] == 0)
+    order: list[int] = []
+
+    while queue:
+        current = queue.pop(0)
+        order.append(current)
+        for dep in sorted(dependents[current]):
+            in_degree[dep] -= 1
+            if in_degree[dep] == 0:
+                queue.append(dep)
+        queue.sort()
+
+    # If there are cycles, append remaining nodes in index order
+    remaining: list[int] = []
+    if len(order) < n:
+        remaining = sorted(set(range(n)) - set(order))
+        order.extend(remaining)
+
+    return tuple(order), tuple(remaining)
+
+
 class Dispatcher:
     """Execute an ActionPlan by dispatching each action to its executor."""
 
@@ -116,43 +165,16 @@ class Dispatcher:
         """Topological sort of actions by their ``depends_on`` edges.
 
         Actions with no dependencies come first. Within the same
-        dependency depth, the original list order is preserved.
+        dependency depth, the original list order is preserved. The order
+        depends only on the edges, so it is memoized on them.
         """
-        n = len(plan.actions)
-        if n == 0:
-            return []
-
-        # Build in-degree map
-        in_degree: dict[int, int] = {i: 0 for i in range(n)}
-        dependents: dict[int, list[int]] = {i: [] for i in range(n)}
-
-        for i, action in enumerate(plan.actions):
-            for dep in action.depends_on:
-                if 0 <= dep < n:
-                    in_degree[i] += 1
-                    dependents[dep].append(i)
-
-        # Kahn's algorithm — use sorted() to preserve original order among
-        # actions with equal readiness.
-        queue = sorted(i for i in range(n) if in_degree[i] == 0)
-        order: list[int] = []
-
-        while queue:
-            current = queue.pop(0)
-            order.append(current)
-            for dep in sorted(dependents[current]):
-                in_degree[dep] -= 1
-                if in_degree[dep] == 0:
-                    queue.append(dep)
-            queue.sort()
-
-        # If there are cycles, append remaining nodes in index order
-        if len(order) < n:
-            remaining = sorted(set(range(n)) - set(order))
-            logger.warning("Cycle detected in action dependencies — appending remaining: %s", remaining)
-            order.extend(remaining)
-
-        return order
+        order, cyclic = _topo_order(tuple(tuple(a.depends_on) for a in plan.actions))
+        if cyclic:
+            logger.warning(
+                "Cycle detected in action dependencies — appending remaining: %s",
+                list(cyclic),
+            )
+        return list(order)
 
     @staticmethod
     def _check_dependencies(
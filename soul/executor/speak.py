@@ -12,6 +12,7 @@ import logging
 import os
 from typing import TYPE_CHECKING
 
+
 if TYPE_CHECKING:
     from soul.config import SoulConfig
 
@@ -9,17 +9,18 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import TYPE_CHECKING
+import weakref
 
 from soul.config import SoulConfig
-from soul.memory.store import SoulStore
-from soul.memory.residents import ResidentManager
 from soul.memory.facility import FacilityManager
 from soul.memory.preferences import PreferenceManager
+from soul.memory.residents import ResidentManager
+from soul.memory.store import SoulStore
 from soul.memory.tasks import TaskLogger
 from soul.stt.base import BaseSTT
 from soul.stt.text_fallback import TextFallbackSTT
 
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +29,15 @@ class SoulLoop:
 
     def __init__(self, config: SoulConfig | None = None):
         self.config = config or SoulConfig.from_env()
+        # Build Whisper first: its model loads on a background thread while
+        # the store and the rest of start-up run, and _get_stt() only waits
+        # for whatever load time is left.
+        self._stt_pending: BaseSTT | None = None
+        if self.config.stt_enabled:
+            try:
+                self._stt_pending = self._new_whisper_stt()
+            except Exception as e:
+                logger.warning("Whisper init failed (%s), falling back to text input", e)
         self.store = SoulStore(db_path=self.config.db_path or None)
         self.residents = ResidentManager(self.store)
         self.facility = FacilityManager(self.store)
@@ -45,15 +55,30 @@ class SoulLoop:
         self._current_conversation_id: str | None = None
         self._running = False
 
+        # Release the database even if shutdown() is never called (loop
+        # garbage-collected or interpreter exit); must not reference self.
+        # SoulStore connections are thread-local, so this closes only the
+        # connection of the thread it runs on: shutdown() on the loop's
+        # thread, or whichever thread the GC / atexit hook happens to use.
+        # A finalizer runs at most once, so shutdown() calls it directly.
+        self._finalizer = weakref.finalize(self, self.store.close)
+
+    def _new_whisper_stt(self) -> BaseSTT:
+        """Construct WhisperSTT; its model starts loading in the background."""
+        from soul.stt.whisper_stt import WhisperSTT
+
+        return WhisperSTT(
+            model_size=self.config.whisper_model,
+            device=self.config.whisper_device,
+        )
+
     def _get_stt(self) -> BaseSTT:
         if self._stt is None:
             if self.config.stt_enabled:
                 try:
-                    from soul.stt.whisper_stt import WhisperSTT
-                    stt = WhisperSTT(
-                        model_size=self.config.whisper_model,
-                        device=self.config.whisper_device,
-                    )
+                    stt, self._stt_pending = self._stt_pending, None
+                    if stt is None:
+                        stt = self._new_whisper_stt()
                     if stt.is_available():
                         self._stt = stt
                         logger.info("Whisper STT initialized")
@@ -83,9 +108,9 @@ class SoulLoop:
     def _get_dispatcher(self):
         if self._dispatcher is None:
             from soul.executor.dispatcher import Dispatcher
-            from soul.executor.speak import Speaker
-            from soul.executor.navigate import Navigator
             from soul.executor.manipulate import Manipulator
+            from soul.executor.navigate import Navigator
+            from soul.executor.speak import Speaker
 
             self._dispatcher = Dispatcher(
                 speaker=Speaker(self.config),
@@ -168,20 +193,13 @@ class SoulLoop:
         act_time = time.monotonic() - t1
         logger.info("Actions executed in %.0fms", act_time * 1000)
 
-        # Remember — log task and conversation
-        if self._current_conversation_id:
-            self.task_logger.add_message(
-                self._current_conversation_id, "user", text
-            )
-            self.task_logger.add_message(
-                self._current_conversation_id, "assistant", result.response_text
-            )
-
-        self.task_logger.log_task(
+        # Remember — log task and conversation (one commit)
+        self.task_logger.log_turn(
             task_type=result.intent.category.value,
-            description=text[:200],
+            text=text,
+            response_text=result.response_text,
             resident_id=self._current_resident_id,
-            result=result.response_text[:500],
+            conversation_id=self._current_conversation_id,
         )
 
         return {
@@ -239,7 +257,7 @@ class SoulLoop:
 
         while self._running:
             try:
-                text = input(f"You: ").strip()
+                text = input("You: ").strip()
             except (EOFError, KeyboardInterrupt):
                 break
 
@@ -272,14 +290,15 @@ class SoulLoop:
         """Clean shutdown."""
         self._running = False
         self.end_conversation()
-        self.store.close()
+        for stt in (self._stt, self._stt_pending):
+            if stt is not None:
+                stt.close()
+        self._finalizer()  # store.close(), exactly once
         logger.info("Soul System shut down")
 
 
 def main():
     """Entry point for the Soul System."""
-    import sys
-
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+
 if TYPE_CHECKING:
     from soul.memory.store import SoulStore
 
@@ -27,13 +28,30 @@ class FacilityManager:
         description: str | None = None,
         navigable: bool = True,
     ) -> str:
-        lid = self._store._new_id()
         with self._store._transaction():
-            self._store._conn.execute(
-                "INSERT INTO locations (id, name, location_type, floor, description, navigable) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (lid, name, location_type, floor, description, int(navigable)),
+            return self._add_location_in_txn(
+                name, location_type, floor, description, navigable
             )
+
+    def _add_location_in_txn(
+        self,
+        name: str,
+        location_type: str,
+        floor: int = 1,
+        description: str | None = None,
+        navigable: bool = True,
+    ) -> str:
+        """Body of :meth:`add_location` without committing.
+
+        Lets callers seed several locations inside one
+        ``store._transaction()`` instead of committing each.
+        """
+        lid = self._store._new_id()
+        self._store._conn.execute(
+            "INSERT INTO locations (id, name, location_type, floor, description, navigable) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (lid, name, location_type, floor, description, int(navigable)),
+        )
         return lid
 
     def get_location(self, location_id: str) -> dict | None:
@@ -10,6 +10,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+
 if TYPE_CHECKING:
     from soul.memory.store import SoulStore
 
@@ -37,6 +38,25 @@ class PreferenceManager:
         confidence: float | None = None,
     ) -> str:
         """Set or update a preference. If it exists, update value and boost confidence."""
+        with self._store._transaction():
+            return self._set_in_txn(
+                resident_id, category, key, value, source=source, confidence=confidence
+            )
+
+    def _set_in_txn(
+        self,
+        resident_id: str,
+        category: str,
+        key: str,
+        value: str,
+        source: str = "observed",
+        confidence: float | None = None,
+    ) -> str:
+        """Body of :meth:`set` without committing.
+
+        Lets callers seed several preferences inside one
+        ``store._transaction()`` instead of committing each.
+        """
         existing = self._store._conn.execute(
             "SELECT id, confidence FROM preferences "
             "WHERE resident_id = ? AND category = ? AND key = ?",
@@ -52,19 +72,16 @@ class PreferenceManager:
                 "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                 (value, new_confidence, source, existing["id"]),
             )
-            self._store._conn.commit()
             return existing["id"]
-        else:
-            pid = self._store._new_id()
-            conf = confidence if confidence is not None else _DEFAULT_CONFIDENCE
-            with self._store._transaction():
-                self._store._conn.execute(
-                    "INSERT INTO preferences "
-                    "(id, resident_id, category, key, value, confidence, source) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (pid, resident_id, category, key, value, conf, source),
-                )
-            return pid
+        pid = self._store._new_id()
+        conf = confidence if confidence is not None else _DEFAULT_CONFIDENCE
+        self._store._conn.execute(
+            "INSERT INTO preferences "
+            "(id, resident_id, category, key, value, confidence, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (pid, resident_id, category, key, value, conf, source),
+        )
+        return pid
 
     def get(self, resident_id: str, category: str, key: str) -> dict | None:
         row = self._store._conn.execute(
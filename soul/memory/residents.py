@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import TYPE_CHECKING
 
+
 if TYPE_CHECKING:
     from soul.memory.store import SoulStore
 
@@ -74,6 +74,9 @@ class ResidentManager:
 
     def delete(self, resident_id: str) -> None:
         with self._store._transaction():
+            # Check FK constraints once at COMMIT rather than after each of
+            # the dependent-row deletes below (reset automatically on commit).
+            self._store._conn.execute("PRAGMA defer_foreign_keys=ON")
             self._store._conn.execute(
                 "DELETE FROM conversation_messages WHERE conversation_id IN "
                 "(SELECT id FROM conversations WHERE resident_id = ?)",
@@ -12,11 +12,12 @@ import logging
 import os
 import sqlite3
 import threading
-import uuid
+from urllib.parse import parse_qs
+
 
 logger = logging.getLogger(__name__)
 
-_SCHEMA_VERSION = 2
+_SCHEMA_VERSION = 5
 
 
 def _default_db_path() -> str:
@@ -25,13 +26,62 @@ def _default_db_path() -> str:
     return os.path.join(base, "soul.db")
 
 
+def _is_in_memory(db_path: str, uri: bool) -> bool:
+    """True for ``:memory:`` and for ``file::memory:...`` / ``mode=memory`` URIs."""
+    if not uri:
+        return db_path == ":memory:"
+    path, _, query = db_path.removeprefix("file:").partition("?")
+    return path == ":memory:" or "memory" in parse_qs(query).get("mode", ())
+
+
 class SoulStore:
     """Thread-safe SQLite wrapper for Soul System state."""
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(
+        self,
+        db_path: str | None = None,
+        uri: bool | None = None,
+        durable: bool = True,
+    ):
+        """Open (and migrate) the store at *db_path*.
+
+        *db_path* may be an SQLite URI such as
+        ``file:soul?mode=memory&cache=shared``; *uri* defaults to True for
+        paths starting with ``file:``. In-memory databases (``:memory:`` or
+        ``mode=memory``) skip WAL and fsyncs. ``durable=False`` skips fsyncs and
+        keeps temp tables in memory — for throwaway (test) databases only,
+        since a crash can lose recent commits.
+        """
+        self._configure(db_path, uri, durable)
+        self._migrate()
+
+    @classmethod
+    def from_template(
+        cls,
+        template_conn: sqlite3.Connection,
+        db_path: str = ":memory:",
+        uri: bool | None = None,
+        durable: bool = True,
+    ) -> SoulStore:
+        """Open *db_path* as a page-level copy of an already-migrated database.
+
+        Uses ``Connection.backup`` instead of replaying the migrations, which
+        makes spinning up many identical (test) databases cheap. Any existing
+        contents of *db_path* are replaced. A plain ``:memory:`` copy is
+        private to the calling thread; pass a shared-cache URI if other
+        threads need it.
+        """
+        store = cls.__new__(cls)
+        store._configure(db_path, uri, durable)
+        template_conn.backup(store._conn)
+        return store
+
+    def _configure(self, db_path: str | None, uri: bool | None, durable: bool) -> None:
         self._db_path = db_path or _default_db_path()
+        self._uri = self._db_path.startswith("file:") if uri is None else uri
+        self._durable = durable
+        self._in_memory = _is_in_memory(self._db_path, self._uri)
         self._local = threading.local()
-        self._migrate()
 
     # -- connection handling ---------------------------------------------------
 
@@ -39,16 +89,32 @@ class SoulStore:
     def _conn(self) -> sqlite3.Connection:
         conn = getattr(self._local, "conn", None)
         if conn is None:
-            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn = sqlite3.connect(
+                self._db_path, check_same_thread=False, uri=self._uri
+            )
             conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL needs a file; in-memory databases journal in memory
+            conn.execute(
+                "PRAGMA journal_mode=MEMORY" if self._in_memory else "PRAGMA journal_mode=WAL"
+            )
             conn.execute("PRAGMA foreign_keys=ON")
+            # Bound ANALYZE / PRAGMA optimize cost on large tables
+            conn.execute("PRAGMA analysis_limit=1000")
+            # Nothing to fsync for an in-memory database
+            if self._in_memory or not self._durable:
+                conn.execute("PRAGMA synchronous=OFF")
+                conn.execute("PRAGMA temp_store=MEMORY")
             self._local.conn = conn
         return conn
 
     def close(self) -> None:
         conn = getattr(self._local, "conn", None)
         if conn is not None:
+            try:
+                # Refresh planner stats if stale (no-op when current)
+                conn.execute("PRAGMA optimize")
+            except Exception:
+                pass
             try:
                 conn.close()
             except Exception:
@@ -76,8 +142,12 @@ class SoulStore:
         row = c.execute("SELECT version FROM schema_version").fetchone()
         current_version = row[0] if row else 0
 
+        # All pending steps run as one script in one transaction, so a failure
+        # part-way leaves the previous schema (and version) intact.
+        steps: list[str] = []
+
         if current_version < 1:
-            c.executescript("""
+            steps.append("""
                 CREATE TABLE IF NOT EXISTS residents (
                     id TEXT PRIMARY KEY,
                     name TEXT NOT NULL,
@@ -163,7 +233,7 @@ class SoulStore:
             """)
 
         if current_version < 2:
-            c.executescript("""
+            steps.append("""
                 CREATE TABLE IF NOT EXISTS speaker_embeddings (
                     id TEXT PRIMARY KEY,
                     resident_id TEXT NOT NULL REFERENCES residents(id),
@@ -175,23 +245,78 @@ class SoulStore:
                     ON speaker_embeddings(resident_id);
             """)
 
-        if current_version == 0:
-            c.execute(
-                "INSERT INTO schema_version (version) VALUES (?)",
-                (_SCHEMA_VERSION,),
+        if current_version < 3:
+            # (resident_id, started_at DESC) serves the recent-tasks queries as
+            # an index range scan with early LIMIT cutoff — no temp B-tree sort.
+            steps.append("""
+                CREATE INDEX IF NOT EXISTS idx_task_history_resident_time
+                    ON task_history(resident_id, started_at DESC);
+                DROP INDEX IF EXISTS idx_task_history_resident;
+            """)
+
+        if current_version < 4:
+            # Embedding blob format: 'f32' = raw float32 (pre-v4 rows),
+            # 'q8' = float32 scale + int8 components (soul.stt.speaker_id)
+            steps.append(
+                "ALTER TABLE speaker_embeddings "
+                "ADD COLUMN encoding TEXT NOT NULL DEFAULT 'f32';"
             )
+
+        if current_version < 5:
+            # Monotonic change counter for speaker_embeddings, bumped by
+            # triggers on every write, so SpeakerIdentifier can tell when its
+            # cached embeddings are stale (COUNT/MAX(rowid) can repeat once a
+            # freed rowid is reused).
+            steps.append("""
+                CREATE TABLE IF NOT EXISTS speaker_embeddings_version (
+                    version INTEGER NOT NULL
+                );
+                INSERT INTO speaker_embeddings_version (version)
+                    SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM speaker_embeddings_version);
+                CREATE TRIGGER IF NOT EXISTS trg_speaker_emb_insert
+                    AFTER INSERT ON speaker_embeddings
+                BEGIN
+                    UPDATE speaker_embeddings_version SET version = version + 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_speaker_emb_update
+                    AFTER UPDATE ON speaker_embeddings
+                BEGIN
+                    UPDATE speaker_embeddings_version SET version = version + 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_speaker_emb_delete
+                    AFTER DELETE ON speaker_embeddings
+                BEGIN
+                    UPDATE speaker_embeddings_version SET version = version + 1;
+                END;
+            """)
+
+        if current_version == 0:
+            steps.append(f"INSERT INTO schema_version (version) VALUES ({_SCHEMA_VERSION});")
         elif current_version < _SCHEMA_VERSION:
-            c.execute(
-                "UPDATE schema_version SET version = ?", (_SCHEMA_VERSION,)
-            )
+            steps.append(f"UPDATE schema_version SET version = {_SCHEMA_VERSION};")
+
+        if not steps:
+            return
+        try:
+            c.executescript("BEGIN;\n" + "\n".join(steps) + "\nCOMMIT;")
+        except Exception:
+            if c.in_transaction:
+                c.rollback()
+            raise
 
+        # Persist planner statistics (sqlite_stat1) for the new schema so index
+        # choice does not fall back to hardcoded selectivity heuristics; on
+        # later opens, PRAGMA optimize in close() keeps them current.
+        c.execute("ANALYZE")
         c.commit()
 
     # -- helpers ---------------------------------------------------------------
 
     @staticmethod
     def _new_id() -> str:
-        return uuid.uuid4().hex[:12]
+        # 12 random hex chars (48 bits), same format as uuid4().hex[:12]
+        # without building a UUID object
+        return os.urandom(6).hex()
 
     def _row_to_dict(self, row: sqlite3.Row | None) -> dict | None:
         if row is None:
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 import logging
 from typing import TYPE_CHECKING
 
+
 if TYPE_CHECKING:
     from soul.memory.store import SoulStore
 
@@ -25,16 +27,55 @@ class TaskLogger:
         status: str = "completed",
         result: str | None = None,
     ) -> str:
-        tid = self._store._new_id()
         with self._store._transaction():
-            self._store._conn.execute(
-                "INSERT INTO task_history "
-                "(id, resident_id, task_type, description, status, result) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (tid, resident_id, task_type, description, status, result),
+            return self._log_task_in_txn(
+                task_type, description, resident_id, status, result
             )
+
+    def _log_task_in_txn(
+        self,
+        task_type: str,
+        description: str,
+        resident_id: str | None = None,
+        status: str = "completed",
+        result: str | None = None,
+    ) -> str:
+        """Body of :meth:`log_task` without committing."""
+        tid = self._store._new_id()
+        self._store._conn.execute(
+            "INSERT INTO task_history "
+            "(id, resident_id, task_type, description, status, result) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (tid, resident_id, task_type, description, status, result),
+        )
         return tid
 
+    def log_turn(
+        self,
+        task_type: str,
+        text: str,
+        response_text: str,
+        resident_id: str | None = None,
+        conversation_id: str | None = None,
+    ) -> str:
+        """Record one interaction turn with a single commit.
+
+        Appends the user/assistant messages to *conversation_id* (if any) and
+        logs the turn as a completed task, instead of committing each row.
+        Returns the task ID.
+        """
+        with self._store._transaction():
+            if conversation_id:
+                self._add_messages_in_txn(
+                    conversation_id, [("user", text), ("assistant", response_text)]
+                )
+            return self._log_task_in_txn(
+                task_type,
+                text[:200],
+                resident_id=resident_id,
+                result=response_text[:500],
+            )
+
     def update_task(self, task_id: str, status: str, result: str | None = None) -> None:
         self._store._conn.execute(
             "UPDATE task_history SET status = ?, result = ?, "
@@ -89,6 +130,22 @@ class TaskLogger:
         )
         self._store._conn.commit()
 
+    def add_messages_bulk(
+        self, conversation_id: str, messages: Iterable[tuple[str, str]]
+    ) -> None:
+        """Append ``(role, content)`` pairs in order with a single commit."""
+        with self._store._transaction():
+            self._add_messages_in_txn(conversation_id, messages)
+
+    def _add_messages_in_txn(
+        self, conversation_id: str, messages: Iterable[tuple[str, str]]
+    ) -> None:
+        self._store._conn.executemany(
+            "INSERT INTO conversation_messages (conversation_id, role, content) "
+            "VALUES (?, ?, ?)",
+            ((conversation_id, role, content) for role, content in messages),
+        )
+
     def end_conversation(
         self, conversation_id: str, summary: str | None = None
     ) -> None:
@@ -99,15 +156,34 @@ class TaskLogger:
         )
         self._store._conn.commit()
 
+    def iter_conversation_messages(
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield messages oldest-first without materializing the full result.
+
+        *offset*/*limit* page through long conversations (e.g. UI scrollback).
+        """
+        cur = self._store._conn.execute(
+            "SELECT * FROM conversation_messages "
+            "WHERE conversation_id = ? ORDER BY created_at ASC, id ASC "
+            "LIMIT ? OFFSET ?",
+            (conversation_id, -1 if limit is None else limit, offset),
+        )
+        for row in cur:
+            yield dict(row)
+
     def get_conversation_messages(
-        self, conversation_id: str
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: int | None = None,
     ) -> list[dict]:
-        rows = self._store._conn.execute(
-            "SELECT * FROM conversation_messages "
-            "WHERE conversation_id = ? ORDER BY created_at ASC",
-            (conversation_id,),
-        ).fetchall()
-        return self._store._rows_to_list(rows)
+        return list(
+            self.iter_conversation_messages(conversation_id, offset=offset, limit=limit)
+        )
 
     def recent_summaries(
         self, resident_id: str, limit: int = 5
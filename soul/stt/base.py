@@ -6,9 +6,13 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Utterance:
-    """A transcribed speech utterance."""
+    """A transcribed speech utterance.
+
+    Immutable and hashable, so cached results can be shared and utterances
+    used as keys when deduplicating.
+    """
 
     text: str
     language: str = "en"
@@ -29,3 +33,6 @@ class BaseSTT(ABC):
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the STT engine is ready."""
+
+    def close(self) -> None:
+        """Release worker threads or other resources; a no-op by default."""
@@ -5,6 +5,16 @@ against stored speaker embeddings using cosine similarity.
 
 Requires the optional ``wespeakerruntime`` package. When not installed the
 module degrades gracefully — ``is_available()`` returns False.
+
+When the optional ``faiss`` package is installed, enrolled embeddings are kept
+in an in-memory inner-product index (L2-normalized, so inner product equals
+cosine) and ``identify()`` is a single ``search`` call. Without it, the stored
+embeddings are stacked into a cached, row-normalized matrix and scored with
+one matrix-vector product against the normalized query.
+
+Embeddings are L2-normalized at enrollment and stored int8-quantized with a
+per-vector scale (``encoding`` 'q8'); rows written before schema v4 remain
+raw, unnormalized float32 ('f32').
 """
 
 from __future__ import annotations
@@ -14,11 +24,23 @@ import struct
 import tempfile
 from typing import TYPE_CHECKING
 
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from soul.memory.store import SoulStore
 
 logger = logging.getLogger(__name__)
 
+# Shared SQL text, so every call hits the connection's prepared-statement
+# cache (keyed by SQL string) instead of re-parsing.
+_INSERT_EMBEDDING_SQL = (
+    "INSERT INTO speaker_embeddings (id, resident_id, embedding, encoding) "
+    "VALUES (?, ?, ?, 'q8')"
+)
+_SELECT_EMBEDDINGS_SQL = "SELECT resident_id, embedding, encoding FROM speaker_embeddings"
+_STAMP_EMBEDDINGS_SQL = "SELECT version FROM speaker_embeddings_version"
+
 
 class SpeakerIdentifier:
     """Voice-based resident identification using wespeaker ONNX models."""
@@ -27,6 +49,19 @@ class SpeakerIdentifier:
         self._store = store
         self._threshold = threshold
         self._model = None
+        # faiss index over enrolled embeddings, built lazily from SQLite;
+        # _index_ids[i] is the resident_id of the i-th indexed vector.
+        self._index = None
+        self._index_ids: list[str] = []
+        # Without faiss: (N, D) float32 matrix of L2-normalized enrolled
+        # embeddings, built lazily from SQLite and dropped on enroll();
+        # _matrix_ids[i] is the resident_id of row i.
+        self._matrix = None
+        self._matrix_ids: list[str] = []
+        # speaker_embeddings_version (bumped by triggers on every write) when
+        # the caches above were last in sync, so rows written or deleted
+        # through another connection force a rebuild.
+        self._stamp: int | None = None
 
     def _get_model(self):
         """Lazy-load wespeaker ONNX model."""
@@ -67,22 +102,15 @@ class SpeakerIdentifier:
         if embedding is None:
             return None
 
-        rows = self._store._conn.execute(
-            "SELECT resident_id, embedding FROM speaker_embeddings"
-        ).fetchall()
-        if not rows:
+        self._sync_caches()
+        index = self._get_index()
+        if index is not None:
+            best_id, best_score = self._search_index(index, embedding)
+        else:
+            best_id, best_score = self._scan(embedding)
+        if best_id is None:
             return None
 
-        best_id = None
-        best_score = -1.0
-
-        for row in rows:
-            stored = _blob_to_floats(row["embedding"])
-            score = _cosine_similarity(embedding, stored)
-            if score > best_score:
-                best_score = score
-                best_id = row["resident_id"]
-
         if best_score >= self._threshold:
             logger.info(
                 "Speaker identified as %s (score=%.3f)", best_id, best_score
@@ -99,38 +127,215 @@ class SpeakerIdentifier:
             return False
 
         emb_id = self._store._new_id()
-        blob = _floats_to_blob(embedding)
+        blob = _quantize_to_blob(_normalized(embedding))
+        fresh = self._stamp == self._embeddings_stamp()
         with self._store._transaction():
-            self._store._conn.execute(
-                "INSERT INTO speaker_embeddings (id, resident_id, embedding) "
-                "VALUES (?, ?, ?)",
-                (emb_id, resident_id, blob),
-            )
+            self._store._conn.execute(_INSERT_EMBEDDING_SQL, (emb_id, resident_id, blob))
+        self._after_enroll(resident_id, [embedding], fresh)
         logger.info("Enrolled voice for resident %s (id=%s)", resident_id, emb_id)
         return True
 
+    def enroll_batch(self, resident_id: str, samples: Iterable[bytes]) -> int:
+        """Enroll several voice samples for a resident with a single commit.
+
+        Samples whose embedding cannot be extracted are skipped. Returns the
+        number of embeddings stored.
+        """
+        embeddings = [
+            e for e in map(self.extract_embedding, samples) if e is not None
+        ]
+        if not embeddings:
+            return 0
+
+        fresh = self._stamp == self._embeddings_stamp()
+        with self._store._transaction() as conn:
+            conn.executemany(
+                _INSERT_EMBEDDING_SQL,
+                [
+                    (self._store._new_id(), resident_id, _quantize_to_blob(_normalized(e)))
+                    for e in embeddings
+                ],
+            )
+        self._after_enroll(resident_id, embeddings, fresh)
+        logger.info(
+            "Enrolled %d voice samples for resident %s", len(embeddings), resident_id
+        )
+        return len(embeddings)
+
+    # -- caches ----------------------------------------------------------------
+
+    def _embeddings_stamp(self) -> int:
+        return self._store._conn.execute(_STAMP_EMBEDDINGS_SQL).fetchone()[0]
+
+    def _sync_caches(self) -> None:
+        """Drop the scoring caches if speaker_embeddings changed under them."""
+        stamp = self._embeddings_stamp()
+        if stamp != self._stamp:
+            self._index = None
+            self._matrix = None
+            self._stamp = stamp
+
+    def _after_enroll(
+        self, resident_id: str, embeddings: list[list[float]], fresh: bool
+    ) -> None:
+        """Bring the caches up to date with embeddings just written.
+
+        *fresh* says whether the caches matched the table before the write;
+        only then can the faiss index be appended to instead of rebuilt.
+        """
+        self._matrix = None
+        if self._index is not None and fresh:
+            for embedding in embeddings:
+                self._add_to_index(self._index, resident_id, embedding)
+            self._stamp = self._embeddings_stamp()
+        else:
+            self._index = None
+
+    # -- scoring ---------------------------------------------------------------
+
+    def _scan(self, embedding: list[float]) -> tuple[str | None, float]:
+        """Score every stored embedding with one matrix-vector product
+        (used when faiss is unavailable)."""
+        import numpy as np
+
+        matrix = self._get_matrix()
+        query = _normalized(embedding)
+        if matrix is None or query.shape[0] != matrix.shape[1]:
+            return None, -1.0
+        # Rows and query are unit length, so the dot product is the cosine
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        return self._matrix_ids[best], float(scores[best])
+
+    def _get_matrix(self):
+        """Lazy-stack stored embeddings into a matrix. Returns None when empty."""
+        if self._matrix is None:
+            import numpy as np
+
+            rows = self._store._conn.execute(_SELECT_EMBEDDINGS_SQL).fetchall()
+            vectors = [_decode_embedding(row["embedding"], row["encoding"]) for row in rows]
+            if not vectors:
+                return None
+            # Rows of a different dimension can never match; skip them as
+            # _add_to_index does
+            dim = len(vectors[0])
+            keep = [i for i, v in enumerate(vectors) if len(v) == dim]
+            matrix = np.array([vectors[i] for i in keep], dtype=np.float32)
+            # Legacy f32 rows are unnormalized and q8 rounding drifts the
+            # norm, so normalize once here; zero rows stay zero
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms > 0, norms, 1.0)
+            self._matrix = matrix
+            self._matrix_ids = [rows[i]["resident_id"] for i in keep]
+        return self._matrix
+
+    def _get_index(self):
+        """Lazy-build the faiss index from SQLite. Returns None without faiss."""
+        if self._index is None:
+            try:
+                import faiss
+            except ImportError:
+                return None
+
+            rows = self._store._conn.execute(_SELECT_EMBEDDINGS_SQL).fetchall()
+            if not rows:
+                return None
+            vectors = [_decode_embedding(row["embedding"], row["encoding"]) for row in rows]
+            index = faiss.IndexFlatIP(len(vectors[0]))
+            self._index_ids = []
+            for row, vector in zip(rows, vectors):
+                self._add_to_index(index, row["resident_id"], vector)
+            self._index = index
+        return self._index
+
+    def _add_to_index(self, index, resident_id: str, embedding: list[float]) -> None:
+        if len(embedding) != index.d:
+            logger.warning(
+                "Skipping embedding for %s: dim %d != index dim %d",
+                resident_id, len(embedding), index.d,
+            )
+            return
+        index.add(_normalized(embedding)[None, :])
+        self._index_ids.append(resident_id)
+
+    def _search_index(self, index, embedding: list[float]) -> tuple[str | None, float]:
+        if len(embedding) != index.d or index.ntotal == 0:
+            return None, -1.0
+        scores, positions = index.search(_normalized(embedding)[None, :], 1)
+        pos = int(positions[0, 0])
+        if pos < 0:
+            return None, -1.0
+        return self._index_ids[pos], float(scores[0, 0])
+
 
 # -- helper functions --------------------------------------------------------
 
 
 def _floats_to_blob(floats: list[float]) -> bytes:
-    """Pack a list of floats into a compact binary blob."""
+    """Pack a list of floats into a compact binary blob (the pre-v4 'f32' format)."""
     return struct.pack(f"{len(floats)}f", *floats)
 
 
-def _blob_to_floats(blob: bytes) -> list[float]:
-    """Unpack a binary blob back into a list of floats."""
-    n = len(blob) // 4  # 4 bytes per float32
-    return list(struct.unpack(f"{n}f", blob))
+def _blob_to_floats(blob: bytes):
+    """Unpack a binary blob as a read-only float32 numpy view (no copy)."""
+    import numpy as np
+
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _quantize_to_blob(floats: list[float]) -> bytes:
+    """Pack a vector as a float32 step size followed by int8 components.
+
+    The step is ``max(|x|) / 127``, so each vector uses the full int8 range;
+    a 256-D embedding takes 260 bytes instead of 1024. Cosine scores move by
+    well under 0.01.
+    """
+    import numpy as np
+
+    vec = np.asarray(floats, dtype=np.float32)
+    peak = float(np.max(np.abs(vec))) if vec.size else 0.0
+    step = peak / 127.0
+    if step > 0:
+        q = np.clip(np.rint(vec / step), -127, 127).astype(np.int8)
+    else:
+        q = np.zeros(vec.shape, dtype=np.int8)
+    return struct.pack("<f", step) + q.tobytes()
+
+
+def _dequantize_blob(blob: bytes):
+    """Inverse of :func:`_quantize_to_blob`, as a float32 numpy vector."""
+    import numpy as np
+
+    (step,) = struct.unpack_from("<f", blob)
+    return np.frombuffer(blob, dtype=np.int8, offset=4).astype(np.float32) * step
+
+
+def _decode_embedding(blob: bytes, encoding: str):
+    """Decode a stored embedding according to its ``encoding`` column."""
+    if encoding == "q8":
+        return _dequantize_blob(blob)
+    return _blob_to_floats(blob)
+
+
+def _normalized(floats: list[float]):
+    """Return *floats* as an L2-normalized float32 numpy vector (zero stays zero)."""
+    import numpy as np
+
+    vec = np.asarray(floats, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
 
+def _cosine_similarity(a, b) -> float:
+    """Compute cosine similarity between two vectors (lists or numpy arrays)."""
+    import numpy as np
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    if len(a) != len(b):
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    if a.shape != b.shape:
         return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = sum(x * x for x in a) ** 0.5
-    norm_b = sum(x * x for x in b) ** 0.5
-    if norm_a == 0 or norm_b == 0:
+    # One sqrt over the product of squared norms instead of two
+    denom = np.sqrt(np.vdot(a, a) * np.vdot(b, b))
+    if denom == 0:
         return 0.0
-    return dot / (norm_a * norm_b)
+    return float(np.dot(a, b) / denom)
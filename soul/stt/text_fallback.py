@@ -2,20 +2,33 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from soul.stt.base import BaseSTT, Utterance
 
 
+@lru_cache(maxsize=1024)
+def _decode(audio_data: bytes) -> Utterance | None:
+    """Decode text bytes into an Utterance, memoized on the exact input bytes."""
+    text = audio_data.decode("utf-8", errors="replace").strip()
+    if not text:
+        return None
+    return Utterance(text=text, confidence=1.0)
+
+
 class TextFallbackSTT(BaseSTT):
     """Passthrough that wraps raw text as an Utterance.
 
     Used when STT is disabled (SOUL_STT_ENABLED=false) or for testing.
+    Repeat inputs return the same cached Utterance instance.
     """
 
     def transcribe(self, audio_data: bytes) -> Utterance | None:
-        text = audio_data.decode("utf-8", errors="replace").strip()
-        if not text:
+        audio_data = bytes(audio_data)
+        # Blank input is rejected before the cache so it takes no LRU slots
+        if not audio_data.strip():
             return None
-        return Utterance(text=text, confidence=1.0)
+        return _decode(audio_data)
 
     def is_available(self) -> bool:
         return True
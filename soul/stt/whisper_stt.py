@@ -2,86 +2,545 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import bisect
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import io
 import logging
+import threading
+from typing import Any, Protocol
 
 from soul.stt.base import BaseSTT, Utterance
 
+
 logger = logging.getLogger(__name__)
 
+# faster-whisper decodes and resamples all input to 16 kHz mono
+_SAMPLE_RATE = 16000
+
+_AUDIO_FORMATS = frozenset({"container", "pcm16_16k"})
+
+# Languages whose detection probability is reported as-is; for any other
+# detected language the probability is inverted (see WhisperSTT._confidence)
+_DIRECT_CONFIDENCE_LANGS = frozenset({"en"})
+
+# Tried in order when the requested compute_type is rejected by the device
+_FALLBACK_COMPUTE_TYPES = ("float16", "float32")
+
+
+def _supported_compute_types(device: str) -> set[str]:
+    """Return the compute types CTranslate2 supports on *device* (empty if unknown)."""
+    try:
+        import ctranslate2
+
+        return set(ctranslate2.get_supported_compute_types(device))
+    except Exception:
+        return set()
+
+
+# Fastest CTranslate2 quantization per device, best first: INT8 weights with
+# FP16 activations use Tensor Cores on GPU; plain INT8 hits the MKL/oneDNN
+# fast path on CPU.
+_PREFERRED_COMPUTE_TYPES = {
+    "cuda": ("int8_float16", "int8"),
+    "cpu": ("int8",),
+}
+
+
+def _resolve_compute_type(device: str, compute_type: str) -> str:
+    """Map ``"auto"`` to the fastest type *device* supports; keep explicit types."""
+    if compute_type != "auto":
+        return compute_type
+    supported = _supported_compute_types(device)
+    for candidate in _PREFERRED_COMPUTE_TYPES.get(device, ()):
+        if candidate in supported:
+            return candidate
+    # Unknown device or probe failed — let CTranslate2 decide
+    return "auto"
+
+
+# Single greedy decode per chunk. A single temperature disables the
+# temperature-fallback retry loop (up to 6 extra decodes on low-confidence
+# chunks); short voice commands lose next to no accuracy.
+_GREEDY_DECODE = {
+    "beam_size": 1,
+    "best_of": 1,
+    "temperature": 0.0,
+    "no_speech_threshold": 0.6,
+    "condition_on_previous_text": False,
+}
+
+# Whisper's encoder window; every clip is padded to this length, so voiced
+# regions of one utterance are merged into clips up to this long
+_MAX_CLIP_S = 30
+# Clips per encoder forward pass in transcribe_batch (faster-whisper's default)
+_BATCH_SIZE = 8
+
+# CTranslate2 CPU throughput stops scaling (and can regress) beyond ~8 threads
+_MAX_CPU_THREADS = 8
+
+
+@lru_cache(maxsize=1)
+def _physical_cores() -> int:
+    """Count physical (performance) cores; hyperthreads only add contention."""
+    import glob
+    import os
+    import platform
+    import subprocess
+
+    logical = os.cpu_count() or 1
+    system = platform.system()
+    if system == "Linux":
+        cores = set()
+        for topo in glob.glob("/sys/devices/system/cpu/cpu[0-9]*/topology"):
+            try:
+                with open(os.path.join(topo, "physical_package_id")) as f:
+                    package = f.read().strip()
+                with open(os.path.join(topo, "core_id")) as f:
+                    cores.add((package, f.read().strip()))
+            except OSError:
+                continue
+        if cores:
+            return min(len(cores), logical)
+    elif system == "Darwin":
+        # perflevel0 = P-cores on Apple Silicon; E-cores slow CT2 down
+        for key in ("hw.perflevel0.physicalcpu", "hw.physicalcpu"):
+            try:
+                out = subprocess.run(
+                    ["sysctl", "-n", key], capture_output=True, text=True, timeout=2
+                )
+                n = int(out.stdout.strip())
+            except (OSError, ValueError, subprocess.SubprocessError):
+                continue
+            if n > 0:
+                return n
+    return logical
+
+
+def _pcm16_to_float32(audio_data: bytes):
+    """Convert raw 16 kHz int16 PCM to the float32 [-1, 1] array Whisper expects."""
+    import numpy as np
+
+    return np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _overlap_words(previous: list[str], current: list[str]) -> int:
+    """Length of the longest suffix of *previous* that prefixes *current*.
+
+    Words are compared case- and punctuation-insensitively, since the same
+    overlapped audio is often punctuated differently in each window.
+    """
+    def norm(word: str) -> str:
+        return word.strip(".,!?;:\"'").lower()
+
+    for k in range(min(len(previous), len(current)), 0, -1):
+        if [norm(w) for w in previous[-k:]] == [norm(w) for w in current[:k]]:
+            return k
+    return 0
+
+
+@lru_cache(maxsize=4)
+def _load_whisper(model_size: str, device: str, compute_type: str):
+    """Load a WhisperModel, shared process-wide per (size, device, compute_type).
+
+    Weight loading is disk-bound and dominates startup, so every WhisperSTT
+    instance with the same settings reuses one CTranslate2 model.
+    """
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        logger.error(
+            "faster-whisper not installed. "
+            "Install with: pip install faster-whisper"
+        )
+        raise
+
+    compute_type = _resolve_compute_type(device, compute_type)
+    logger.debug(
+        "CTranslate2 compute types on %s: %s (using %s)",
+        device,
+        sorted(_supported_compute_types(device)) or "unknown",
+        compute_type,
+    )
+    # A type the hardware rejects despite the probe (e.g. int8 on some
+    # consumer GPUs) raises ValueError, so fall back to progressively safer
+    # types.
+    candidates = [compute_type] + [
+        ct for ct in _FALLBACK_COMPUTE_TYPES if ct != compute_type
+    ]
+    threading_kwargs = {}
+    if device == "cpu":
+        threading_kwargs = {
+            "cpu_threads": min(_physical_cores(), _MAX_CPU_THREADS),
+            "num_workers": 1,
+        }
+    for i, candidate in enumerate(candidates):
+        try:
+            model = WhisperModel(
+                model_size, device=device, compute_type=candidate, **threading_kwargs
+            )
+        except ValueError as exc:
+            if i == len(candidates) - 1:
+                raise
+            logger.warning(
+                "compute_type %s unsupported on %s (%s), trying %s",
+                candidate,
+                device,
+                exc,
+                candidates[i + 1],
+            )
+            continue
+        logger.info(
+            "Whisper model loaded: %s on %s (compute_type=%s)",
+            model_size,
+            device,
+            candidate,
+        )
+        return model
+
+
+# Serializes model loads so concurrent callers (e.g. preload thread and first
+# transcribe) coalesce onto one load instead of racing
+_load_lock = threading.Lock()
+
+# How long is_available() waits for a background preload to finish
+_PRELOAD_TIMEOUT = 60.0
+
+# Drop cached models at exit so device memory is released cleanly
+atexit.register(_load_whisper.cache_clear)
+
+
+class WhisperModelLike(Protocol):
+    """The slice of faster-whisper's ``WhisperModel`` that WhisperSTT calls."""
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> tuple[Iterable[Any], Any]:
+        """Return ``(segments, info)`` for *audio*."""
+        ...
+
 
 class WhisperSTT(BaseSTT):
     """Speech-to-text using faster-whisper (CTranslate2 backend).
 
-    Runs on CPU by default (~200-400ms for base.en model).
+    Runs on CPU by default (~200-400ms for base.en model). The language is
+    pinned to Norwegian so no language-identification pass runs; pass
+    ``language=None`` to auto-detect instead.
+
+    *audio_format* selects how input bytes are interpreted: ``"container"``
+    (WAV/MP3/... decoded by faster-whisper) or ``"pcm16_16k"`` (raw 16 kHz
+    mono little-endian int16, converted in-process with no decoder).
+
+    *model* plugs in an already-built model (anything matching
+    :class:`WhisperModelLike`); nothing is loaded or preloaded then.
     """
 
     def __init__(
         self,
         model_size: str = "small",
         device: str = "cpu",
-        compute_type: str = "int8",
+        compute_type: str = "auto",
+        language: str | None = "no",
+        audio_format: str = "container",
+        vad_threshold: float = 0.5,
+        vad_min_silence_ms: int = 200,
+        vad_speech_pad_ms: int = 100,
+        preload: bool = True,
+        model: WhisperModelLike | None = None,
     ):
+        if audio_format not in _AUDIO_FORMATS:
+            raise ValueError(
+                f"audio_format must be one of {sorted(_AUDIO_FORMATS)}, got {audio_format!r}"
+            )
         self._model_size = model_size
         self._device = device
         self._compute_type = compute_type
-        self._model = None
+        self._language = language
+        self._audio_format = audio_format
+        # Tighter than Silero's defaults (2000 ms silence, 400 ms pad) so long
+        # pauses in an utterance are cut before they reach the encoder.
+        self._vad_parameters = {
+            "threshold": vad_threshold,
+            "min_silence_duration_ms": vad_min_silence_ms,
+            "speech_pad_ms": vad_speech_pad_ms,
+        }
+        self._model = model
+        self._batched = None
+        # Worker for transcribe_async, created on first use; see _get_pool()
+        self._pool: ThreadPoolExecutor | None = None
+
+        # Load weights in the background so the first utterance doesn't pay
+        # the multi-second disk load; _get_model() callers wait on the lock.
+        self._preload_thread: threading.Thread | None = None
+        if preload and model is None:
+            self._preload_thread = threading.Thread(
+                target=self._preload, name="whisper-preload", daemon=True
+            )
+            self._preload_thread.start()
 
     def _get_model(self):
         if self._model is None:
-            try:
-                from faster_whisper import WhisperModel
-
-                self._model = WhisperModel(
-                    self._model_size,
-                    device=self._device,
-                    compute_type=self._compute_type,
-                )
-                logger.info(
-                    "Whisper model loaded: %s on %s",
-                    self._model_size,
-                    self._device,
-                )
-            except ImportError:
-                logger.error(
-                    "faster-whisper not installed. "
-                    "Install with: pip install faster-whisper"
-                )
-                raise
+            with _load_lock:
+                if self._model is None:
+                    # Resolve "auto" before the cache lookup so it shares a
+                    # model with instances that name the same type explicitly
+                    self._model = _load_whisper(
+                        self._model_size,
+                        self._device,
+                        _resolve_compute_type(self._device, self._compute_type),
+                    )
         return self._model
 
-    def transcribe(self, audio_data: bytes) -> Utterance | None:
-        import io
+    def _preload(self) -> None:
+        try:
+            self._get_model()
+        except Exception as exc:
+            logger.warning("Whisper preload failed: %s", exc)
 
+    def _model_input(self, audio_data: bytes):
+        """Raw PCM becomes a float32 array; containers go through a file object."""
+        if self._audio_format == "pcm16_16k":
+            return _pcm16_to_float32(audio_data)
+        # faster-whisper accepts file-like objects — avoid temp file I/O.
+        # BytesIO over an immutable bytes object shares its buffer until
+        # written to, so this wraps the payload without copying it; a pooled
+        # buffer would have to copy the audio in on every call instead.
+        return io.BytesIO(audio_data)
+
+    def transcribe(self, audio_data: bytes) -> Utterance | None:
         model = self._get_model()
 
-        # faster-whisper accepts file-like objects — avoid temp file I/O
         segments, info = model.transcribe(
-            io.BytesIO(audio_data),
-            beam_size=1,
-            language="no",
+            self._model_input(audio_data),
+            task="transcribe",
+            language=self._language,
             vad_filter=True,
+            vad_parameters=self._vad_parameters,
+            **_GREEDY_DECODE,
         )
 
+        # Single pass over the lazily-decoded segments; CTranslate2 emits them
+        # in temporal order, so the last segment's end is the duration.
         text_parts = []
         total_duration = 0.0
         for segment in segments:
-            text_parts.append(segment.text.strip())
-            total_duration = max(total_duration, segment.end)
+            text = segment.text.strip()
+            if text:
+                text_parts.append(text)
+            total_duration = segment.end
 
-        full_text = " ".join(text_parts).strip()
-        if not full_text:
+        if not text_parts:
             return None
 
         return Utterance(
-            text=full_text,
+            text=" ".join(text_parts),
             language=info.language,
-            confidence=1.0 - info.language_probability
-            if info.language != "en"
-            else info.language_probability,
+            confidence=self._confidence(info),
             duration=total_duration,
         )
 
+    def transcribe_stream(
+        self,
+        audio_iter: Iterable[bytes],
+        window_s: float = 3.0,
+        overlap_s: float = 0.5,
+    ) -> Iterator[Utterance]:
+        """Transcribe raw PCM while it is still being captured.
+
+        Audio chunks from *audio_iter* are gathered into *window_s* windows
+        that overlap by *overlap_s*; each window is decoded as soon as it
+        fills, prompted with the transcript so far. Words repeated across
+        the overlap are dropped, so each yielded Utterance carries only new
+        text. Requires ``audio_format="pcm16_16k"``.
+        """
+        if self._audio_format != "pcm16_16k":
+            raise ValueError("transcribe_stream requires audio_format='pcm16_16k'")
+        if not 0 <= overlap_s < window_s:
+            raise ValueError("overlap_s must be in [0, window_s)")
+
+        window_bytes = int(window_s * _SAMPLE_RATE) * 2
+        overlap_bytes = int(overlap_s * _SAMPLE_RATE) * 2
+        buffer = bytearray()
+        fresh = 0  # bytes in buffer not yet covered by a decoded window
+        words: list[str] = []
+
+        def decode(window: bytes) -> Utterance | None:
+            segments, info = self._get_model().transcribe(
+                _pcm16_to_float32(window),
+                task="transcribe",
+                language=self._language,
+                vad_filter=True,
+                vad_parameters=self._vad_parameters,
+                initial_prompt=" ".join(words) or None,
+                **_GREEDY_DECODE,
+            )
+            new = " ".join(seg.text.strip() for seg in segments).split()
+            new = new[_overlap_words(words, new):]
+            if not new:
+                return None
+            words.extend(new)
+            return Utterance(
+                text=" ".join(new),
+                language=info.language,
+                confidence=self._confidence(info),
+                duration=len(window) / 2 / _SAMPLE_RATE,
+            )
+
+        for chunk in audio_iter:
+            buffer += chunk
+            fresh += len(chunk)
+            while len(buffer) >= window_bytes:
+                utterance = decode(bytes(buffer[:window_bytes]))
+                if utterance is not None:
+                    yield utterance
+                del buffer[: window_bytes - overlap_bytes]
+                fresh = max(0, len(buffer) - overlap_bytes)
+
+        # Flush the tail captured after the last full window
+        if fresh:
+            utterance = decode(bytes(buffer))
+            if utterance is not None:
+                yield utterance
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            # One worker to match the model's num_workers=1: CTranslate2
+            # releases the GIL while decoding, so the event loop keeps
+            # running LLM I/O.
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+        return self._pool
+
+    async def transcribe_async(self, audio_data: bytes) -> Utterance | None:
+        """Run :meth:`transcribe` on the STT worker thread without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), self.transcribe, audio_data)
+
+    def close(self) -> None:
+        """Shut down the transcribe_async worker, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def transcribe_batch(self, audio_list: list[bytes]) -> list[Utterance | None]:
+        """Transcribe several queued utterances in one batched encoder pass.
+
+        The utterances are laid end-to-end and each one's voiced span (split
+        only past 30 s) is handed to faster-whisper's BatchedInferencePipeline
+        as an explicit clip, so the utterances share each forward pass.
+        Results are in input order, with None where no speech was detected.
+        """
+        if not audio_list:
+            return []
+
+        import numpy as np
+
+        pipeline = self._get_batched()
+
+        if self._audio_format == "pcm16_16k":
+            arrays = [_pcm16_to_float32(audio) for audio in audio_list]
+        else:
+            from faster_whisper import decode_audio
+
+            arrays = [
+                decode_audio(self._model_input(audio), sampling_rate=_SAMPLE_RATE)
+                for audio in audio_list
+            ]
+        from faster_whisper.vad import get_speech_timestamps
+
+        # Explicit clips bypass the pipeline's own VAD, so run it per utterance
+        # here. Each clip is padded to a full encoder window, so an
+        # utterance's voiced regions are merged (first start to last end)
+        # into as few clips of at most _MAX_CLIP_S as possible; leading and
+        # trailing silence is still dropped. Clip times are offsets into the
+        # concatenated audio.
+        max_clip = _MAX_CLIP_S * _SAMPLE_RATE
+        clips: list[dict] = []
+        clip_owner: list[int] = []  # clip index -> audio_list index
+        owner_start = [0.0] * len(audio_list)
+        offset = 0
+        for i, arr in enumerate(arrays):
+            owner_start[i] = offset / _SAMPLE_RATE
+            if len(arr) == 0:
+                continue
+            spans: list[list[int]] = []
+            for ts in get_speech_timestamps(
+                arr,
+                sampling_rate=_SAMPLE_RATE,
+                max_speech_duration_s=_MAX_CLIP_S,
+                **self._vad_parameters,
+            ):
+                if spans and ts["end"] - spans[-1][0] <= max_clip:
+                    spans[-1][1] = ts["end"]
+                else:
+                    spans.append([ts["start"], ts["end"]])
+            for start, end in spans:
+                clips.append(
+                    {
+                        "start": (offset + start) / _SAMPLE_RATE,
+                        "end": (offset + end) / _SAMPLE_RATE,
+                    }
+                )
+                clip_owner.append(i)
+            offset += len(arr)
+
+        results: list[Utterance | None] = [None] * len(audio_list)
+        if not clips:
+            return results
+
+        segments, info = pipeline.transcribe(
+            np.concatenate(arrays),
+            task="transcribe",
+            language=self._language,
+            clip_timestamps=clips,
+            batch_size=min(len(clips), _BATCH_SIZE),
+            **_GREEDY_DECODE,
+        )
+
+        # Assign each segment to the utterance owning the clip at its midpoint
+        clip_starts = [c["start"] for c in clips]
+        parts: list[list[str]] = [[] for _ in audio_list]
+        last_end = [0.0] * len(audio_list)
+        for segment in segments:
+            mid = (segment.start + segment.end) / 2
+            owner = clip_owner[max(0, bisect.bisect_right(clip_starts, mid) - 1)]
+            text = segment.text.strip()
+            if text:
+                parts[owner].append(text)
+            last_end[owner] = segment.end - owner_start[owner]
+
+        confidence = self._confidence(info)
+        for i, texts in enumerate(parts):
+            if texts:
+                results[i] = Utterance(
+                    text=" ".join(texts),
+                    language=info.language,
+                    confidence=confidence,
+                    duration=last_end[i],
+                )
+        return results
+
+    def _confidence(self, info) -> float:
+        """Utterance confidence; 1.0 when the language is pinned (no LID run)."""
+        if self._language is not None:
+            return 1.0
+        p = info.language_probability
+        return p if info.language in _DIRECT_CONFIDENCE_LANGS else 1.0 - p
+
+    def _get_batched(self):
+        """Lazy-wrap the shared model in a BatchedInferencePipeline."""
+        if self._batched is None:
+            from faster_whisper import BatchedInferencePipeline
+
+            self._batched = BatchedInferencePipeline(model=self._get_model())
+        return self._batched
+
     def is_available(self) -> bool:
+        if self._preload_thread is not None:
+            self._preload_thread.join(timeout=_PRELOAD_TIMEOUT)
+            if self._preload_thread.is_alive():
+                logger.warning("Whisper model still loading after %.0fs", _PRELOAD_TIMEOUT)
+                return False
         try:
             self._get_model()
             return True
@@ -1,27 +1,125 @@
 """Shared fixtures for Soul System tests."""
 
+from collections import namedtuple
+from unittest.mock import MagicMock
+import uuid
+
 import pytest
 
 from soul.config import SoulConfig
-from soul.memory.store import SoulStore
-from soul.memory.residents import ResidentManager
+from soul.loop import SoulLoop
 from soul.memory.facility import FacilityManager
 from soul.memory.preferences import PreferenceManager
+from soul.memory.residents import ResidentManager
+from soul.memory.store import SoulStore
 from soul.memory.tasks import TaskLogger
 
 
-@pytest.fixture
-def db_path(tmp_path):
-    return str(tmp_path / "test_soul.db")
+# Just the attributes the engines read (response.content[0].text); plain
+# tuples are far cheaper to build than MagicMock chains.
+_Content = namedtuple("_Content", ["text"])
+_Response = namedtuple("_Response", ["content"])
 
 
-@pytest.fixture
-def store(db_path):
-    s = SoulStore(db_path=db_path)
+def _clear_tables(store: SoulStore) -> None:
+    """Delete every row (schema, change counters and planner stats are kept)."""
+    conn = store._conn
+    tables = [
+        r["name"]
+        for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' "
+            "AND name NOT IN ('schema_version', 'speaker_embeddings_version')"
+        )
+    ]
+    with store._transaction():
+        # FK checks run once at COMMIT, so deletion order doesn't matter
+        conn.execute("PRAGMA defer_foreign_keys=ON")
+        for table in tables:
+            conn.execute(f"DELETE FROM {table}")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "on_disk: back the test database with a real file instead of memory"
+    )
+
+
+@pytest.fixture(scope="session")
+def _schema_template():
+    """Connection to a freshly migrated database; the migrations run only here."""
+    s = SoulStore(db_path=":memory:")
+    yield s._conn
+    s.close()
+
+
+@pytest.fixture(scope="session")
+def _memory_store(_schema_template):
+    """One migrated in-memory database for the whole test session.
+
+    A named shared-cache URI lets every connection in the session (other
+    threads, extra SoulStore/SoulLoop instances) reach the same database
+    with no file I/O; it lives as long as this store's connection is open.
+    The random name keeps ``pytest -n`` (xdist) workers on separate databases.
+    """
+    s = SoulStore.from_template(
+        _schema_template,
+        db_path=f"file:soul-{uuid.uuid4().hex}?mode=memory&cache=shared",
+        durable=False,
+    )
     yield s
     s.close()
 
 
+@pytest.fixture(scope="session")
+def _disk_store(_schema_template, tmp_path_factory):
+    """One migrated on-disk database for the session, for ``on_disk`` tests."""
+    s = SoulStore.from_template(
+        _schema_template,
+        db_path=str(tmp_path_factory.mktemp("soul") / "test_soul.db"),
+        durable=False,
+    )
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def _shared_store(request):
+    name = "_disk_store" if request.node.get_closest_marker("on_disk") else "_memory_store"
+    return request.getfixturevalue(name)
+
+
+def _write_marker(store: SoulStore) -> tuple:
+    """Changes iff anything was committed: data_version tracks other
+    connections (threads, other SoulStores), total_changes this one."""
+    conn = store._conn
+    return conn, conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+@pytest.fixture
+def db_path(_shared_store):
+    """Path (or URI) of the shared test database; emptied again after each test.
+
+    Tests that open their own SoulStore/SoulLoop on this path see an empty
+    (already migrated) database. Read-only tests skip the clean-up.
+    """
+    before = _write_marker(_shared_store)
+    yield _shared_store._db_path
+    if _write_marker(_shared_store) != before:
+        _clear_tables(_shared_store)
+
+
+@pytest.fixture
+def disk_db_path(tmp_path):
+    """A fresh on-disk database path, for tests that reopen the file."""
+    return str(tmp_path / "soul.db")
+
+
+@pytest.fixture
+def store(_shared_store, db_path):
+    return _shared_store
+
+
 @pytest.fixture
 def residents(store):
     return ResidentManager(store)
@@ -52,19 +150,134 @@ def config():
     )
 
 
+@pytest.fixture(scope="session")
+def mock_anthropic_response():
+    """Factory for building fake Anthropic API responses."""
+    def _make(text: str):
+        return _Response(content=[_Content(text=text)])
+    return _make
+
+
+@pytest.fixture(scope="session")
+def _shared_anthropic():
+    """Session-wide stand-ins for the ``anthropic`` module, one per engine."""
+    return {"haiku": MagicMock(), "sonnet": MagicMock()}
+
+
+def _patched_anthropic(shared, engine, monkeypatch):
+    mod = shared[engine]
+    # Each engine gets its own fake SDK (bypassing the shared client cache)
+    # so tests can tell Haiku calls from Sonnet calls
+    monkeypatch.setattr(
+        f"soul.cognition.{engine}.get_client",
+        lambda api_key: mod.Anthropic(api_key=api_key),
+    )
+    yield mod
+    mod.reset_mock()
+    # reset_mock() does not propagate return_value/side_effect to children
+    mod.Anthropic.return_value.messages.create.reset_mock(
+        return_value=True, side_effect=True
+    )
+
+
+@pytest.fixture
+def haiku_anthropic(_shared_anthropic, monkeypatch):
+    """Fake ``anthropic`` module HaikuEngine builds its client from; reset after the test."""
+    yield from _patched_anthropic(_shared_anthropic, "haiku", monkeypatch)
+
+
+@pytest.fixture
+def sonnet_anthropic(_shared_anthropic, monkeypatch):
+    """Fake ``anthropic`` module SonnetEngine builds its client from; reset after the test."""
+    yield from _patched_anthropic(_shared_anthropic, "sonnet", monkeypatch)
+
+
+@pytest.fixture
+def haiku_client(haiku_anthropic):
+    """The client HaikuEngine gets from ``anthropic.Anthropic(...)``."""
+    return haiku_anthropic.Anthropic.return_value
+
+
+@pytest.fixture
+def sonnet_client(sonnet_anthropic):
+    """The client SonnetEngine gets from ``anthropic.Anthropic(...)``."""
+    return sonnet_anthropic.Anthropic.return_value
+
+
+@pytest.fixture(scope="session")
+def _shared_soul_loop(_memory_store):
+    """One SoulLoop for the session, on the shared in-memory database."""
+    loop = SoulLoop(SoulConfig(
+        anthropic_api_key="test-key",
+        tts_provider="pyttsx3",
+        groot_enabled=False,
+        stt_enabled=False,
+        db_path=_memory_store._db_path,
+    ))
+    yield loop
+    loop.shutdown()
+
+
+@pytest.fixture
+def soul_loop(_shared_soul_loop, db_path):
+    """The shared SoulLoop, returned to a fresh state after each test.
+
+    Lazy components are dropped so tests can swap in their own brain or
+    dispatcher; the database is emptied by ``db_path``.
+    """
+    loop = _shared_soul_loop
+    yield loop
+    loop._running = False
+    loop._current_resident_id = None
+    loop._current_conversation_id = None
+    loop._brain = None
+    loop._dispatcher = None
+    loop._stt = None
+    loop._speaker_id = None
+
+
 @pytest.fixture
 def sample_resident(residents):
     """Create a sample resident and return their ID."""
     return residents.create(name="Martha", room="204", notes="Loves gardening")
 
 
+# (category, key, value, confidence) seeded by ``seeded_prefs``
+_SEEDED_PREFS = (
+    ("drink", "tea", "chamomile", 0.9),
+    ("food", "breakfast", "oatmeal", 0.9),
+    ("food", "snack", "biscuits", 0.7),
+    ("activity", "hobby", "gardening", 0.3),
+)
+
+
+@pytest.fixture
+def seeded_prefs(preferences, store, sample_resident):
+    """Give the sample resident the _SEEDED_PREFS in one transaction; return their ID."""
+    with store._transaction():
+        for category, key, value, confidence in _SEEDED_PREFS:
+            preferences._set_in_txn(
+                sample_resident, category, key, value, confidence=confidence
+            )
+    return sample_resident
+
+
+# key -> (name, location_type, floor, description, navigable) seeded by ``sample_facility``
+_SAMPLE_LOCATIONS = {
+    "dining": ("Dining Hall", "common_area", 1, "Main dining area", True),
+    "garden": ("Garden", "outdoor", 1, "Accessible garden with raised beds", True),
+    "room_204": ("Room 204", "resident_room", 2, None, True),
+    "kitchen": ("Kitchen", "staff_area", 1, None, False),
+    "lobby": ("Lobby", "common_area", 1, "Main entrance", True),
+}
+
+
 @pytest.fixture
-def sample_facility(facility):
-    """Seed the facility with common locations."""
-    ids = {}
-    ids["dining"] = facility.add_location("Dining Hall", "common_area", floor=1, description="Main dining area")
-    ids["garden"] = facility.add_location("Garden", "outdoor", floor=1, description="Accessible garden with raised beds")
-    ids["room_204"] = facility.add_location("Room 204", "resident_room", floor=2)
-    ids["kitchen"] = facility.add_location("Kitchen", "staff_area", floor=1, navigable=False)
-    ids["lobby"] = facility.add_location("Lobby", "common_area", floor=1, description="Main entrance")
+def sample_facility(facility, store):
+    """Seed the facility with common locations in one transaction."""
+    with store._transaction():
+        ids = {
+            key: facility._add_location_in_txn(*location)
+            for key, location in _SAMPLE_LOCATIONS.items()
+        }
     return ids
@@ -1,23 +1,16 @@
 """Tests for HaikuEngine, SonnetEngine, and SoulBrain with mocked Anthropic API."""
 
 import json
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from soul.cognition._client import get_client
 from soul.cognition.brain import SoulBrain
 from soul.cognition.haiku import HaikuEngine
-from soul.cognition.prompt import (
-    build_acknowledge_prompt,
-    build_haiku_prompt,
-    build_sonnet_prompt,
-)
-from soul.cognition.schemas import (
-    ActionPlan,
-    ActionType,
-    IntentCategory,
-    InteractionResult,
-)
+from soul.cognition.prompt import build_acknowledge_prompt, build_haiku_prompt, build_sonnet_prompt
+from soul.cognition.schemas import ActionType, IntentCategory, InteractionResult
 from soul.cognition.sonnet import SonnetEngine, _extract_json
 from soul.config import SoulConfig
 
@@ -26,25 +19,22 @@ from soul.config import SoulConfig
 # Fixtures
 # =========================================================================
 
-@pytest.fixture
-def mock_anthropic_response():
-    """Factory for building mock Anthropic API responses."""
-    def _make(text: str):
-        mock_content = MagicMock()
-        mock_content.text = text
-        mock_response = MagicMock()
-        mock_response.content = [mock_content]
-        return mock_response
-    return _make
+@pytest.fixture(autouse=True)
+def _patch_anthropic(haiku_anthropic, sonnet_anthropic):
+    """Route both engines to the shared fake ``anthropic`` modules."""
 
 
 @pytest.fixture
-def mock_client(mock_anthropic_response):
-    """A mock Anthropic client whose messages.create returns configurable text."""
-    client = MagicMock()
-    # Default response
-    client.messages.create.return_value = mock_anthropic_response("Hello, Martha!")
-    return client
+def shared_sdk(monkeypatch):
+    """Undo the per-engine fakes: both engines use the real, empty client
+    cache over one fake ``anthropic`` module."""
+    fake = MagicMock()
+    monkeypatch.setattr("soul.cognition._client.anthropic", fake)
+    for engine in ("haiku", "sonnet"):
+        monkeypatch.setattr(f"soul.cognition.{engine}.get_client", get_client)
+    get_client.cache_clear()
+    yield fake
+    get_client.cache_clear()
 
 
 # =========================================================================
@@ -111,53 +101,64 @@ class TestHaikuEngine:
         engine = HaikuEngine(config)
         assert engine._client is None
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_respond(self, mock_anthropic_mod, config, mock_anthropic_response):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+    def test_respond(self, haiku_client, config, mock_anthropic_response):
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Good morning, Martha! How lovely to see you today."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         engine = HaikuEngine(config)
         result = engine.respond("Good morning!", "You are Wybe.")
 
         assert "Martha" in result
-        mock_client.messages.create.assert_called_once()
-        call_kwargs = mock_client.messages.create.call_args[1]
+        haiku_client.messages.create.assert_called_once()
+        call_kwargs = haiku_client.messages.create.call_args[1]
         assert call_kwargs["model"] == config.haiku_model
         assert call_kwargs["system"] == [
             {"type": "text", "text": "You are Wybe.", "cache_control": {"type": "ephemeral"}}
         ]
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_acknowledge(self, mock_anthropic_mod, config, mock_anthropic_response):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+    def test_acknowledge(self, haiku_client, config, mock_anthropic_response):
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Of course, Martha, let me work on that for you."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         engine = HaikuEngine(config)
         result = engine.acknowledge("Can you plan a party?", "Quick ack prompt.")
 
         assert "Martha" in result
-        call_kwargs = mock_client.messages.create.call_args[1]
+        call_kwargs = haiku_client.messages.create.call_args[1]
         assert call_kwargs["max_tokens"] == 256  # Short ack
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_client_initialized_once(self, mock_anthropic_mod, config):
-        mock_anthropic_mod.Anthropic.return_value = MagicMock()
-        mock_anthropic_mod.Anthropic.return_value.messages.create.return_value = MagicMock(
-            content=[MagicMock(text="hi")]
-        )
+    def test_anthropic_imported_on_first_client(self, shared_sdk, config, monkeypatch):
+        fake = MagicMock()
+        monkeypatch.setattr("soul.cognition._client.anthropic", None)
+        monkeypatch.setitem(sys.modules, "anthropic", fake)
+
+        HaikuEngine(config)._get_client()
+
+        fake.Anthropic.assert_called_once_with(api_key="test-key")
+
+    def test_client_initialized_once(
+        self, haiku_anthropic, haiku_client, config, mock_anthropic_response
+    ):
+        haiku_client.messages.create.return_value = mock_anthropic_response("hi")
 
         engine = HaikuEngine(config)
         engine.respond("a", "b")
         engine.respond("c", "d")
 
         # Client should only be created once (lazy singleton)
-        mock_anthropic_mod.Anthropic.assert_called_once()
+        haiku_anthropic.Anthropic.assert_called_once()
+
+    def test_client_shared_across_engines(self, shared_sdk, config):
+        first = HaikuEngine(config)._get_client()
+        assert HaikuEngine(config)._get_client() is first
+        assert SonnetEngine(config)._get_client() is first
+        shared_sdk.Anthropic.assert_called_once_with(api_key="test-key")
+
+        config.anthropic_api_key = "other-key"
+        SonnetEngine(config)._get_client()
+        assert shared_sdk.Anthropic.call_count == 2
 
 
 # =========================================================================
@@ -178,8 +179,17 @@ class TestSonnetEngine:
         raw = '```\n{"actions": []}\n```'
         assert _extract_json(raw) == '{"actions": []}'
 
-    @patch("soul.cognition.sonnet.anthropic")
-    def test_plan_valid_json(self, mock_anthropic_mod, config, mock_anthropic_response):
+    def test_extract_json_plain_skips_regex(self):
+        raw = '  {"actions": []}\n'
+        with patch("soul.cognition.sonnet._FENCE_RE") as fence_re:
+            assert _extract_json(raw) == '{"actions": []}'
+        fence_re.search.assert_not_called()
+
+    def test_extract_json_code_block_after_prose(self):
+        raw = 'Here is the plan:\n```json\n{"actions": []}\n```'
+        assert _extract_json(raw) == '{"actions": []}'
+
+    def test_plan_valid_json(self, sonnet_client, config, mock_anthropic_response):
         plan_json = json.dumps({
             "actions": [
                 {
@@ -198,9 +208,7 @@ class TestSonnetEngine:
             "reasoning": "Martha needs her glasses from her room.",
         })
 
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(plan_json)
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+        sonnet_client.messages.create.return_value = mock_anthropic_response(plan_json)
 
         engine = SonnetEngine(config)
         plan = engine.plan("Bring me my glasses", "Sonnet prompt here.")
@@ -210,8 +218,7 @@ class TestSonnetEngine:
         assert plan.actions[1].action_type == ActionType.NAVIGATE
         assert "glasses" in plan.reasoning.lower()
 
-    @patch("soul.cognition.sonnet.anthropic")
-    def test_plan_wrapped_in_code_block(self, mock_anthropic_mod, config, mock_anthropic_response):
+    def test_plan_wrapped_in_code_block(self, sonnet_client, config, mock_anthropic_response):
         plan_json = '```json\n' + json.dumps({
             "actions": [
                 {"action_type": "speak", "parameters": {"text": "Sure!"}, "priority": 1}
@@ -219,9 +226,7 @@ class TestSonnetEngine:
             "reasoning": "Simple response.",
         }) + '\n```'
 
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(plan_json)
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+        sonnet_client.messages.create.return_value = mock_anthropic_response(plan_json)
 
         engine = SonnetEngine(config)
         plan = engine.plan("Test", "prompt")
@@ -229,13 +234,10 @@ class TestSonnetEngine:
         assert len(plan.actions) == 1
         assert plan.actions[0].action_type == ActionType.SPEAK
 
-    @patch("soul.cognition.sonnet.anthropic")
-    def test_plan_fallback_on_bad_json(self, mock_anthropic_mod, config, mock_anthropic_response):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+    def test_plan_fallback_on_bad_json(self, sonnet_client, config, mock_anthropic_response):
+        sonnet_client.messages.create.return_value = mock_anthropic_response(
             "Sorry, I can't do that right now."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         engine = SonnetEngine(config)
         plan = engine.plan("Do something complex", "prompt")
@@ -244,20 +246,17 @@ class TestSonnetEngine:
         assert len(plan.actions) == 1
         assert plan.actions[0].action_type == ActionType.SPEAK
 
-    @patch("soul.cognition.sonnet.anthropic")
-    def test_plan_uses_sonnet_model(self, mock_anthropic_mod, config, mock_anthropic_response):
+    def test_plan_uses_sonnet_model(self, sonnet_client, config, mock_anthropic_response):
         plan_json = json.dumps({
             "actions": [{"action_type": "speak", "parameters": {"text": "ok"}}],
             "reasoning": "test",
         })
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(plan_json)
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+        sonnet_client.messages.create.return_value = mock_anthropic_response(plan_json)
 
         engine = SonnetEngine(config)
         engine.plan("test", "prompt")
 
-        call_kwargs = mock_client.messages.create.call_args[1]
+        call_kwargs = sonnet_client.messages.create.call_args[1]
         assert call_kwargs["model"] == config.sonnet_model
 
 
@@ -277,15 +276,12 @@ class TestSoulBrain:
             preferences=preferences,
         )
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_greeting_uses_haiku_only(
-        self, mock_anthropic_mod, brain, mock_anthropic_response
+        self, haiku_client, brain, mock_anthropic_response
     ):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Hello! It's wonderful to see you today."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         result = brain.process("Hello!")
 
@@ -294,23 +290,19 @@ class TestSoulBrain:
         assert result.model_used == brain._config.haiku_model
         assert "wonderful" in result.response_text.lower() or "hello" in result.response_text.lower()
         # Only Haiku should be called
-        assert mock_client.messages.create.call_count == 1
+        assert haiku_client.messages.create.call_count == 1
 
-    @patch("soul.cognition.sonnet.anthropic")
-    @patch("soul.cognition.haiku.anthropic")
     def test_item_request_uses_both_engines(
         self,
-        mock_haiku_mod,
-        mock_sonnet_mod,
+        haiku_client,
+        sonnet_client,
         brain,
         mock_anthropic_response,
     ):
         # Haiku for ack
-        haiku_client = MagicMock()
         haiku_client.messages.create.return_value = mock_anthropic_response(
             "Of course! Let me get that for you."
         )
-        mock_haiku_mod.Anthropic.return_value = haiku_client
 
         # Sonnet for plan
         plan_json = json.dumps({
@@ -321,9 +313,7 @@ class TestSoulBrain:
             ],
             "reasoning": "Fetch glasses from room 204.",
         })
-        sonnet_client = MagicMock()
         sonnet_client.messages.create.return_value = mock_anthropic_response(plan_json)
-        mock_sonnet_mod.Anthropic.return_value = sonnet_client
 
         result = brain.process("Bring me my glasses")
 
@@ -332,15 +322,12 @@ class TestSoulBrain:
         assert result.interim_response is not None  # Haiku ack
         assert len(result.action_plan.actions) == 3
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_emergency_creates_alert_action(
-        self, mock_anthropic_mod, brain, mock_anthropic_response
+        self, haiku_client, brain, mock_anthropic_response
     ):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Stay calm, Martha. I'm alerting the staff right now."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         result = brain.process("Help! I've fallen!")
 
@@ -353,47 +340,38 @@ class TestSoulBrain:
         alert = [a for a in result.action_plan.actions if a.action_type == ActionType.ALERT_STAFF][0]
         assert alert.parameters["urgency"] == "critical"
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_farewell_uses_haiku(
-        self, mock_anthropic_mod, brain, mock_anthropic_response
+        self, haiku_client, brain, mock_anthropic_response
     ):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Goodbye! Have a lovely evening."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         result = brain.process("Goodbye, see you tomorrow")
 
         assert result.intent.category == IntentCategory.FAREWELL
         assert result.model_used == brain._config.haiku_model
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_process_with_resident_id(
-        self, mock_anthropic_mod, brain, sample_resident, mock_anthropic_response
+        self, haiku_client, brain, sample_resident, mock_anthropic_response
     ):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Good morning, Martha! How are you today?"
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         result = brain.process("Good morning!", resident_id=sample_resident)
 
         assert result.resident_id == sample_resident
         # The system prompt should have been built with resident context
-        call_kwargs = mock_client.messages.create.call_args[1]
+        call_kwargs = haiku_client.messages.create.call_args[1]
         system_text = call_kwargs["system"][0]["text"]
         assert "Martha" in system_text
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_emergency_with_haiku_failure_still_works(
-        self, mock_anthropic_mod, brain
+        self, haiku_client, brain
     ):
         """Emergency must produce a result even if Haiku API fails."""
-        mock_client = MagicMock()
-        mock_client.messages.create.side_effect = Exception("API down")
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+        haiku_client.messages.create.side_effect = Exception("API down")
 
         result = brain.process("Help! Emergency!")
 
@@ -404,10 +382,8 @@ class TestSoulBrain:
         action_types = [a.action_type for a in result.action_plan.actions]
         assert ActionType.ALERT_STAFF in action_types
 
-    @patch("soul.cognition.sonnet.anthropic")
-    @patch("soul.cognition.haiku.anthropic")
     def test_complex_plan_with_disabled_interim(
-        self, mock_haiku_mod, mock_sonnet_mod, config, store, residents,
+        self, haiku_client, sonnet_client, config, store, residents,
         facility, preferences, mock_anthropic_response,
     ):
         """When interim_response is disabled, Haiku ack should be skipped."""
@@ -423,16 +399,11 @@ class TestSoulBrain:
             preferences=preferences,
         )
 
-        haiku_client = MagicMock()
-        mock_haiku_mod.Anthropic.return_value = haiku_client
-
         plan_json = json.dumps({
             "actions": [{"action_type": "speak", "parameters": {"text": "Done."}}],
             "reasoning": "test",
         })
-        sonnet_client = MagicMock()
         sonnet_client.messages.create.return_value = mock_anthropic_response(plan_json)
-        mock_sonnet_mod.Anthropic.return_value = sonnet_client
 
         result = brain.process("I'd like to organize a birthday party for next Tuesday")
 
@@ -440,46 +411,36 @@ class TestSoulBrain:
         # Haiku should not have been called at all
         haiku_client.messages.create.assert_not_called()
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_preference_uses_haiku(
-        self, mock_anthropic_mod, brain, mock_anthropic_response
+        self, haiku_client, brain, mock_anthropic_response
     ):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "I'll remember that you enjoy chamomile tea!"
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         result = brain.process("I like chamomile tea")
 
         assert result.intent.category == IntentCategory.PREFERENCE
         assert result.model_used == brain._config.haiku_model
 
-    @patch("soul.cognition.haiku.anthropic")
     def test_information_uses_haiku(
-        self, mock_anthropic_mod, brain, mock_anthropic_response
+        self, haiku_client, brain, mock_anthropic_response
     ):
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_anthropic_response(
+        haiku_client.messages.create.return_value = mock_anthropic_response(
             "Lunch today is tomato soup and grilled cheese."
         )
-        mock_anthropic_mod.Anthropic.return_value = mock_client
 
         result = brain.process("What's for lunch today?")
 
         assert result.intent.category == IntentCategory.INFORMATION
         assert result.model_used == brain._config.haiku_model
 
-    @patch("soul.cognition.sonnet.anthropic")
-    @patch("soul.cognition.haiku.anthropic")
     def test_navigate_request(
-        self, mock_haiku_mod, mock_sonnet_mod, brain, mock_anthropic_response
+        self, haiku_client, sonnet_client, brain, mock_anthropic_response
     ):
-        haiku_client = MagicMock()
         haiku_client.messages.create.return_value = mock_anthropic_response(
             "Sure, let me take you there."
         )
-        mock_haiku_mod.Anthropic.return_value = haiku_client
 
         plan_json = json.dumps({
             "actions": [
@@ -488,9 +449,7 @@ class TestSoulBrain:
             ],
             "reasoning": "Navigate to garden.",
         })
-        sonnet_client = MagicMock()
         sonnet_client.messages.create.return_value = mock_anthropic_response(plan_json)
-        mock_sonnet_mod.Anthropic.return_value = sonnet_client
 
         result = brain.process("Take me to the garden")
 
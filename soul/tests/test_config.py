@@ -1,6 +1,7 @@
 """Tests for SoulConfig."""
 
-import os
+
+import pytest
 
 from soul.config import SoulConfig
 
@@ -42,12 +43,40 @@ class TestSoulConfig:
         config = SoulConfig.from_env()
         assert config.anthropic_api_key == "sk-fallback"
 
-    def test_from_env_invalid_int(self, monkeypatch):
-        monkeypatch.setenv("SOUL_GROOT_PORT", "not-a-number")
+    @pytest.mark.parametrize(
+        ("env", "attr", "expected"),
+        [
+            ("SOUL_GROOT_PORT", "groot_port", 5555),
+            ("SOUL_SILENCE_TIMEOUT", "silence_timeout", 2.0),
+        ],
+        ids=["int", "float"],
+    )
+    def test_from_env_invalid_number(self, monkeypatch, env, attr, expected):
+        monkeypatch.setenv(env, "not-a-number")
         config = SoulConfig.from_env()
-        assert config.groot_port == 5555  # falls back to default
+        assert getattr(config, attr) == expected  # falls back to default
+
+    def test_from_env_memoized_on_env_values(self, monkeypatch):
+        from soul.config import _parse_env
+
+        monkeypatch.setenv("SOUL_ROBOT_NAME", "Buddy")
+        _parse_env.cache_clear()
+        a = SoulConfig.from_env()
+        b = SoulConfig.from_env()
+        assert _parse_env.cache_info().hits == 1
+        # Each call still returns its own (mutable) instance
+        assert a == b and a is not b
+
+        monkeypatch.setenv("SOUL_ROBOT_NAME", "Pip")
+        assert SoulConfig.from_env().robot_name == "Pip"
 
-    def test_from_env_invalid_float(self, monkeypatch):
-        monkeypatch.setenv("SOUL_SILENCE_TIMEOUT", "bad")
+    def test_from_env_numeric_formats(self, monkeypatch):
+        monkeypatch.setenv("SOUL_GROOT_PORT", " +7000 ")
+        monkeypatch.setenv("SOUL_SILENCE_TIMEOUT", "1e-1")
+        monkeypatch.setenv("SOUL_SPEAKER_ID_THRESHOLD", ".75")
+        monkeypatch.setenv("SOUL_TTS_RATE", "1.5")  # not an int
         config = SoulConfig.from_env()
-        assert config.silence_timeout == 2.0
+        assert config.groot_port == 7000
+        assert config.silence_timeout == 0.1
+        assert config.speaker_id_threshold == 0.75
+        assert config.tts_rate == 150
@@ -1,16 +1,8 @@
 """Tests for conversation memory — history, summaries, and auto-summarization."""
 
-from unittest.mock import MagicMock, patch
-
-import pytest
-
 from soul.cognition.brain import SoulBrain
 from soul.cognition.haiku import HaikuEngine
 from soul.cognition.prompt import build_haiku_prompt
-from soul.cognition.schemas import IntentCategory
-from soul.config import SoulConfig
-from soul.loop import SoulLoop
-from soul.memory.tasks import TaskLogger
 
 
 # =========================================================================
@@ -20,15 +12,10 @@ from soul.memory.tasks import TaskLogger
 
 class TestHaikuHistory:
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_respond_with_history(self, mock_anthropic_mod, config):
-        mock_client = MagicMock()
-        mock_content = MagicMock()
-        mock_content.text = "Yes, Martha, you mentioned your garden."
-        mock_resp = MagicMock()
-        mock_resp.content = [mock_content]
-        mock_client.messages.create.return_value = mock_resp
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+    def test_respond_with_history(self, haiku_client, config, mock_anthropic_response):
+        haiku_client.messages.create.return_value = mock_anthropic_response(
+            "Yes, Martha, you mentioned your garden."
+        )
 
         engine = HaikuEngine(config)
         history = [
@@ -38,37 +25,25 @@ class TestHaikuHistory:
         result = engine.respond("Do you remember?", "system prompt", history=history)
 
         assert "Martha" in result or "garden" in result
-        call_kwargs = mock_client.messages.create.call_args[1]
+        call_kwargs = haiku_client.messages.create.call_args[1]
         # Should have 3 messages: 2 from history + 1 new
         assert len(call_kwargs["messages"]) == 3
         assert call_kwargs["messages"][0] == {"role": "user", "content": "I love my garden."}
         assert call_kwargs["messages"][2] == {"role": "user", "content": "Do you remember?"}
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_respond_without_history(self, mock_anthropic_mod, config):
-        mock_client = MagicMock()
-        mock_content = MagicMock()
-        mock_content.text = "Hello!"
-        mock_resp = MagicMock()
-        mock_resp.content = [mock_content]
-        mock_client.messages.create.return_value = mock_resp
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+    def test_respond_without_history(self, haiku_client, config, mock_anthropic_response):
+        haiku_client.messages.create.return_value = mock_anthropic_response("Hello!")
 
         engine = HaikuEngine(config)
         engine.respond("Hi", "system prompt")
 
-        call_kwargs = mock_client.messages.create.call_args[1]
+        call_kwargs = haiku_client.messages.create.call_args[1]
         assert len(call_kwargs["messages"]) == 1
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_summarize(self, mock_anthropic_mod, config):
-        mock_client = MagicMock()
-        mock_content = MagicMock()
-        mock_content.text = "Beboeren ba om te og snakket om hagen sin."
-        mock_resp = MagicMock()
-        mock_resp.content = [mock_content]
-        mock_client.messages.create.return_value = mock_resp
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+    def test_summarize(self, haiku_client, config, mock_anthropic_response):
+        haiku_client.messages.create.return_value = mock_anthropic_response(
+            "Beboeren ba om te og snakket om hagen sin."
+        )
 
         engine = HaikuEngine(config)
         messages = [
@@ -78,7 +53,7 @@ class TestHaikuHistory:
         summary = engine.summarize(messages)
 
         assert len(summary) > 0
-        call_kwargs = mock_client.messages.create.call_args[1]
+        call_kwargs = haiku_client.messages.create.call_args[1]
         assert call_kwargs["max_tokens"] == 128
         assert "Norwegian" in call_kwargs["system"] or "norsk" in call_kwargs["system"].lower()
 
@@ -152,14 +127,80 @@ class TestRecentSummaries:
         )
         store._conn.commit()
 
-        for i in range(10):
-            cid = task_logger.start_conversation(rid)
-            task_logger.end_conversation(cid, summary=f"Conversation {i}")
+        with store._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO conversations (id, resident_id, ended_at, summary) "
+                "VALUES (?, ?, CURRENT_TIMESTAMP, ?)",
+                [(store._new_id(), rid, f"Conversation {i}") for i in range(10)],
+            )
 
         summaries = task_logger.recent_summaries(rid, limit=3)
         assert len(summaries) == 3
 
 
+# =========================================================================
+# TaskLogger — message streaming and paging
+# =========================================================================
+
+
+class TestConversationMessagePaging:
+
+    def test_iter_yields_in_order(self, task_logger):
+        cid = task_logger.start_conversation()
+        for i in range(5):
+            task_logger.add_message(cid, "user", f"Message {i}")
+
+        it = task_logger.iter_conversation_messages(cid)
+        assert not isinstance(it, list)
+        assert [m["content"] for m in it] == [f"Message {i}" for i in range(5)]
+
+    def test_offset_and_limit(self, task_logger):
+        cid = task_logger.start_conversation()
+        for i in range(10):
+            task_logger.add_message(cid, "user", f"Message {i}")
+
+        page = task_logger.get_conversation_messages(cid, offset=3, limit=4)
+        assert [m["content"] for m in page] == [f"Message {i}" for i in range(3, 7)]
+
+    def test_add_messages_bulk_preserves_order(self, task_logger):
+        cid = task_logger.start_conversation()
+        task_logger.add_message(cid, "user", "First")
+        task_logger.add_messages_bulk(cid, [("assistant", "Second"), ("user", "Third")])
+
+        msgs = task_logger.get_conversation_messages(cid)
+        assert [(m["role"], m["content"]) for m in msgs] == [
+            ("user", "First"),
+            ("assistant", "Second"),
+            ("user", "Third"),
+        ]
+
+    def test_log_turn_writes_messages_and_task(self, task_logger):
+        cid = task_logger.start_conversation()
+        tid = task_logger.log_turn("greeting", "Hi", "Hello!", conversation_id=cid)
+
+        msgs = task_logger.get_conversation_messages(cid)
+        assert [(m["role"], m["content"]) for m in msgs] == [
+            ("user", "Hi"),
+            ("assistant", "Hello!"),
+        ]
+        task = task_logger.get_task(tid)
+        assert task["task_type"] == "greeting"
+        assert task["description"] == "Hi"
+        assert task["result"] == "Hello!"
+
+    def test_log_turn_without_conversation(self, task_logger):
+        tid = task_logger.log_turn("simple_chat", "x" * 300, "ok")
+        assert len(task_logger.get_task(tid)["description"]) == 200
+
+    def test_offset_without_limit(self, task_logger):
+        cid = task_logger.start_conversation()
+        for i in range(4):
+            task_logger.add_message(cid, "user", f"Message {i}")
+
+        page = task_logger.get_conversation_messages(cid, offset=2)
+        assert [m["content"] for m in page] == ["Message 2", "Message 3"]
+
+
 # =========================================================================
 # SoulBrain — conversation summaries in prompt
 # =========================================================================
@@ -204,17 +245,6 @@ class TestBrainConversationSummaries:
 
 class TestLoopHistory:
 
-    @pytest.fixture
-    def soul_loop(self, db_path):
-        config = SoulConfig(
-            anthropic_api_key="test-key",
-            stt_enabled=False,
-            db_path=db_path,
-        )
-        loop = SoulLoop(config)
-        yield loop
-        loop.shutdown()
-
     def test_build_history_no_conversation(self, soul_loop):
         assert soul_loop._build_history() == []
 
@@ -230,24 +260,20 @@ class TestLoopHistory:
 
     def test_build_history_capped_at_20(self, soul_loop):
         cid = soul_loop.start_conversation()
-        for i in range(30):
-            role = "user" if i % 2 == 0 else "assistant"
-            soul_loop.task_logger.add_message(cid, role, f"Message {i}")
+        soul_loop.task_logger.add_messages_bulk(
+            cid,
+            [("user" if i % 2 == 0 else "assistant", f"Message {i}") for i in range(30)],
+        )
 
         history = soul_loop._build_history()
         assert len(history) == 20
         # Should be the last 20
         assert history[0]["content"] == "Message 10"
 
-    @patch("soul.cognition.haiku.anthropic")
-    def test_end_conversation_auto_summarizes(self, mock_anthropic_mod, soul_loop):
-        mock_client = MagicMock()
-        mock_content = MagicMock()
-        mock_content.text = "Beboeren hilste og spurte om te."
-        mock_resp = MagicMock()
-        mock_resp.content = [mock_content]
-        mock_client.messages.create.return_value = mock_resp
-        mock_anthropic_mod.Anthropic.return_value = mock_client
+    def test_end_conversation_auto_summarizes(self, haiku_client, soul_loop, mock_anthropic_response):
+        haiku_client.messages.create.return_value = mock_anthropic_response(
+            "Beboeren hilste og spurte om te."
+        )
 
         cid = soul_loop.start_conversation()
         soul_loop.task_logger.add_message(cid, "user", "Hello")
@@ -1,7 +1,7 @@
 """Tests for the executor layer — Speaker, Navigator, Manipulator, Dispatcher."""
 
 import sys
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
@@ -13,6 +13,47 @@ from soul.executor.navigate import Navigator
 from soul.executor.speak import Speaker
 
 
+# ---------------------------------------------------------------------------
+# Shared plans
+# ---------------------------------------------------------------------------
+
+# Fixed plans shared by the dispatcher tests. Dispatcher.execute() never
+# mutates a plan, so they are built once at import time.
+_PLAN_EMPTY = ActionPlan(actions=[])
+_PLAN_SPEAK_HELLO = ActionPlan.speak_only("Hello!")
+_PLAN_NAV_GARDEN = ActionPlan(actions=[
+    Action(ActionType.NAVIGATE, {"destination": "Garden"}),
+])
+_PLAN_MANIP_CUP = ActionPlan(actions=[
+    Action(ActionType.MANIPULATE, {"action": "pick_up", "target": "cup"}),
+])
+_PLAN_WAIT_001 = ActionPlan(actions=[
+    Action(ActionType.WAIT, {"duration": 0.01}),
+])
+_PLAN_ALERT_FELL = ActionPlan(actions=[
+    Action(ActionType.ALERT_STAFF, {"message": "Resident fell"}),
+])
+_PLAN_SPEAK_THEN_NAV = ActionPlan(actions=[
+    Action(ActionType.SPEAK, {"text": "On my way!"}, priority=1),
+    Action(ActionType.NAVIGATE, {"destination": "Room 204"}, depends_on=[0]),
+])
+_PLAN_FETCH_CHAIN = ActionPlan(actions=[
+    Action(ActionType.NAVIGATE, {"destination": "Kitchen"}),
+    Action(ActionType.MANIPULATE, {"action": "pick_up", "target": "cup"}, depends_on=[0]),
+    Action(ActionType.SPEAK, {"text": "Here you go!"}, depends_on=[1]),
+])
+_PLAN_MULTI = ActionPlan(
+    actions=[
+        Action(ActionType.SPEAK, {"text": "I'll get that for you!"}),
+        Action(ActionType.NAVIGATE, {"destination": "Kitchen"}, depends_on=[0]),
+        Action(ActionType.MANIPULATE, {"action": "pick_up", "target": "cup"}, depends_on=[1]),
+        Action(ActionType.NAVIGATE, {"destination": "Room 204"}, depends_on=[2]),
+        Action(ActionType.SPEAK, {"text": "Here is your cup!"}, depends_on=[3]),
+    ],
+    reasoning="Resident asked for a cup from the kitchen",
+)
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -51,24 +92,41 @@ def groot_config():
     )
 
 
+class _StubSpeaker:
+    """Stand-in for Speaker exposing only what Dispatcher calls."""
+
+    def __init__(self):
+        self.speak = Mock()
+        self.synthesize = Mock(return_value=None)
+
+
+class _StubNavigator:
+    def __init__(self):
+        self.navigate = Mock(return_value=True)
+
+
+class _StubManipulator:
+    def __init__(self):
+        self.execute = Mock(return_value=True)
+
+
+# Plain stubs instead of MagicMock(spec=...): no class introspection, so a
+# fresh set per test costs next to nothing.
+
+
 @pytest.fixture
 def mock_speaker():
-    speaker = MagicMock(spec=Speaker)
-    return speaker
+    return _StubSpeaker()
 
 
 @pytest.fixture
 def mock_navigator():
-    nav = MagicMock(spec=Navigator)
-    nav.navigate.return_value = True
-    return nav
+    return _StubNavigator()
 
 
 @pytest.fixture
 def mock_manipulator():
-    manip = MagicMock(spec=Manipulator)
-    manip.execute.return_value = True
-    return manip
+    return _StubManipulator()
 
 
 @pytest.fixture
@@ -281,8 +339,7 @@ class TestDispatcher:
 
     def test_speak_action(self, dispatcher, mock_speaker):
         """SPEAK action calls speaker.speak."""
-        plan = ActionPlan.speak_only("Hello!")
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_SPEAK_HELLO)
 
         assert len(results) == 1
         assert results[0].success is True
@@ -291,41 +348,30 @@ class TestDispatcher:
 
     def test_navigate_action(self, dispatcher, mock_navigator):
         """NAVIGATE action calls navigator.navigate."""
-        plan = ActionPlan(actions=[
-            Action(ActionType.NAVIGATE, {"destination": "Garden"}),
-        ])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_NAV_GARDEN)
 
         assert results[0].success is True
         mock_navigator.navigate.assert_called_once_with("Garden")
 
     def test_manipulate_action(self, dispatcher, mock_manipulator):
         """MANIPULATE action calls manipulator.execute."""
-        params = {"action": "pick_up", "target": "cup"}
-        plan = ActionPlan(actions=[
-            Action(ActionType.MANIPULATE, params),
-        ])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_MANIP_CUP)
 
         assert results[0].success is True
-        mock_manipulator.execute.assert_called_once_with(params)
+        mock_manipulator.execute.assert_called_once_with(
+            {"action": "pick_up", "target": "cup"}
+        )
 
     def test_wait_action(self, dispatcher):
         """WAIT action sleeps for the specified duration."""
-        plan = ActionPlan(actions=[
-            Action(ActionType.WAIT, {"duration": 0.01}),
-        ])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_WAIT_001)
 
         assert results[0].success is True
         assert "0.01" in results[0].result_text
 
     def test_alert_staff_action(self, dispatcher, mock_speaker):
         """ALERT_STAFF logs warning and speaks the alert."""
-        plan = ActionPlan(actions=[
-            Action(ActionType.ALERT_STAFF, {"message": "Resident fell"}),
-        ])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_ALERT_FELL)
 
         assert results[0].success is True
         assert results[0].result_text == "Resident fell"
@@ -362,11 +408,7 @@ class TestDispatcher:
 
     def test_dependency_ordering(self, dispatcher, mock_speaker, mock_navigator):
         """Actions execute in dependency order: speak first, then navigate."""
-        plan = ActionPlan(actions=[
-            Action(ActionType.SPEAK, {"text": "On my way!"}, priority=1),
-            Action(ActionType.NAVIGATE, {"destination": "Room 204"}, depends_on=[0]),
-        ])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_SPEAK_THEN_NAV)
 
         assert len(results) == 2
         assert results[0].success is True
@@ -382,12 +424,7 @@ class TestDispatcher:
         """When a dependency fails, dependent actions are skipped."""
         mock_navigator.navigate.return_value = False
 
-        plan = ActionPlan(actions=[
-            Action(ActionType.NAVIGATE, {"destination": "Kitchen"}),
-            Action(ActionType.MANIPULATE, {"action": "pick_up", "target": "cup"}, depends_on=[0]),
-            Action(ActionType.SPEAK, {"text": "Here you go!"}, depends_on=[1]),
-        ])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_FETCH_CHAIN)
 
         assert len(results) == 3
         # Navigate failed
@@ -399,27 +436,47 @@ class TestDispatcher:
         assert results[2].success is False
         assert "dependency" in results[2].error.lower()
 
+    def test_resolve_order_memoized_on_edges(self):
+        from soul.executor.dispatcher import _topo_order
+
+        _topo_order.cache_clear()
+        assert Dispatcher._resolve_order(_PLAN_FETCH_CHAIN) == [0, 1, 2]
+        # Same edges, different actions — served from the cache
+        other = ActionPlan(actions=[
+            Action(ActionType.SPEAK, {"text": "a"}),
+            Action(ActionType.WAIT, {"duration": 0}, depends_on=[0]),
+            Action(ActionType.SPEAK, {"text": "b"}, depends_on=[1]),
+        ])
+        assert Dispatcher._resolve_order(other) == [0, 1, 2]
+        assert _topo_order.cache_info().hits == 1
+
+    def test_cycle_warned_on_every_resolve(self, caplog):
+        """The cycle warning is not swallowed when the order comes from cache."""
+        from soul.executor.dispatcher import _topo_order
+
+        _topo_order.cache_clear()
+        cyclic = ActionPlan(actions=[
+            Action(ActionType.SPEAK, {"text": "a"}, depends_on=[1]),
+            Action(ActionType.SPEAK, {"text": "b"}, depends_on=[0]),
+            Action(ActionType.SPEAK, {"text": "c"}),
+        ])
+        with caplog.at_level("WARNING", logger="soul.executor.dispatcher"):
+            assert Dispatcher._resolve_order(cyclic) == [2, 0, 1]
+            assert Dispatcher._resolve_order(cyclic) == [2, 0, 1]
+        assert _topo_order.cache_info().hits == 1
+        warnings = [r for r in caplog.records if "Cycle detected" in r.getMessage()]
+        assert len(warnings) == 2
+
     def test_empty_plan(self, dispatcher):
         """Empty plan returns empty results."""
-        plan = ActionPlan(actions=[])
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_EMPTY)
         assert results == []
 
     def test_multi_action_plan(
         self, dispatcher, mock_speaker, mock_navigator, mock_manipulator
     ):
         """Complex plan with multiple action types."""
-        plan = ActionPlan(
-            actions=[
-                Action(ActionType.SPEAK, {"text": "I'll get that for you!"}),
-                Action(ActionType.NAVIGATE, {"destination": "Kitchen"}, depends_on=[0]),
-                Action(ActionType.MANIPULATE, {"action": "pick_up", "target": "cup"}, depends_on=[1]),
-                Action(ActionType.NAVIGATE, {"destination": "Room 204"}, depends_on=[2]),
-                Action(ActionType.SPEAK, {"text": "Here is your cup!"}, depends_on=[3]),
-            ],
-            reasoning="Resident asked for a cup from the kitchen",
-        )
-        results = dispatcher.execute(plan)
+        results = dispatcher.execute(_PLAN_MULTI)
 
         assert len(results) == 5
         assert all(r.success for r in results)
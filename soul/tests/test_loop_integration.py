@@ -1,19 +1,25 @@
 """Integration tests — full pipeline with mocked external services."""
 
-from unittest.mock import MagicMock, patch
+from dataclasses import dataclass, field
+import gc
+from unittest.mock import patch
 
 import pytest
 
-from soul.config import SoulConfig
-from soul.loop import SoulLoop
 from soul.cognition.schemas import (
+    Action,
     ActionPlan,
     ActionType,
-    Action,
     Intent,
     IntentCategory,
     InteractionResult,
 )
+from soul.config import SoulConfig
+from soul.executor.dispatcher import ActionResult
+from soul.loop import SoulLoop
+from soul.memory.preferences import PreferenceManager
+from soul.memory.residents import ResidentManager
+from soul.memory.store import SoulStore
 
 
 @pytest.fixture
@@ -27,11 +33,78 @@ def soul_config(db_path):
     )
 
 
+@dataclass
+class _StubBrain:
+    """Stand-in for SoulBrain: returns *result* from process() and records calls."""
+
+    result: InteractionResult | None = None
+    calls: list[tuple[str, dict]] = field(default_factory=list)
+
+    def process(self, text, **kwargs):
+        self.calls.append((text, kwargs))
+        return self.result
+
+
+@dataclass
+class _StubDispatcher:
+    """Stand-in for Dispatcher: execute() returns *results*; speech is recorded."""
+
+    results: list[ActionResult] = field(default_factory=list)
+    speak_calls: list[str] = field(default_factory=list)
+
+    def execute(self, plan, skip_speak=False):
+        return self.results
+
+    def speak(self, text):
+        self.speak_calls.append(text)
+
+
 @pytest.fixture
-def soul_loop(soul_config):
-    loop = SoulLoop(soul_config)
-    yield loop
-    loop.shutdown()
+def stub_brain():
+    return _StubBrain()
+
+
+@pytest.fixture
+def stub_dispatcher():
+    return _StubDispatcher()
+
+
+@pytest.fixture
+def wired_loop(soul_loop, stub_brain, stub_dispatcher):
+    """The shared loop with the stub brain and dispatcher attached."""
+    soul_loop._brain = stub_brain
+    soul_loop._dispatcher = stub_dispatcher
+    return soul_loop
+
+
+def _haiku_result(category: IntentCategory, text: str, response: str) -> InteractionResult:
+    """A speak-only Haiku InteractionResult for *text*."""
+    return InteractionResult(
+        intent=Intent(category, raw_text=text),
+        response_text=response,
+        action_plan=ActionPlan.speak_only(response),
+        model_used="haiku",
+    )
+
+
+# Brain results are never mutated by the loop, so one instance serves every test
+_GREETING_RESULT = _haiku_result(
+    IntentCategory.GREETING, "Hello!", "Hello there! How are you today?"
+)
+_SIMPLE_CHAT_RESULT = _haiku_result(
+    IntentCategory.SIMPLE_CHAT, "How's the weather?", "It's a lovely day!"
+)
+_HI_RESULT = _haiku_result(IntentCategory.GREETING, "Hi", "Hello!")
+_GLASSES_RESULT = InteractionResult(
+    intent=Intent(IntentCategory.COMPLEX_PLAN, raw_text="Get my glasses"),
+    response_text="I'll get your glasses from room 204.",
+    action_plan=ActionPlan(actions=[
+        Action(ActionType.SPEAK, {"text": "On my way!"}),
+        Action(ActionType.NAVIGATE, {"destination": "room_204"}, depends_on=[0]),
+    ]),
+    model_used="sonnet",
+    interim_response="Sure, let me get your glasses!",
+)
 
 
 class TestSoulLoop:
@@ -50,76 +123,44 @@ class TestSoulLoop:
         soul_loop.set_resident(rid)
         assert soul_loop._current_resident_id == rid
 
-    def test_process_text_with_mocked_brain(self, soul_loop):
-        """Full pipeline with mocked brain and dispatcher."""
-        mock_brain = MagicMock()
-        mock_brain.process.return_value = InteractionResult(
-            intent=Intent(IntentCategory.GREETING, raw_text="Hello!"),
-            response_text="Hello there! How are you today?",
-            action_plan=ActionPlan.speak_only("Hello there! How are you today?"),
-            model_used="haiku",
-        )
-        soul_loop._brain = mock_brain
-
-        mock_dispatcher = MagicMock()
-        mock_result = MagicMock()
-        mock_result.success = True
-        mock_dispatcher.execute.return_value = [mock_result]
-        mock_dispatcher.speaker = MagicMock()
-        soul_loop._dispatcher = mock_dispatcher
-
-        soul_loop.start_conversation()
-        result = soul_loop.process_text("Hello!")
-
-        assert result["response_text"] == "Hello there! How are you today?"
+    @pytest.mark.parametrize(
+        "brain_result",
+        [_GREETING_RESULT, _SIMPLE_CHAT_RESULT],
+        ids=["greeting", "simple_chat"],
+    )
+    def test_process_text_with_mocked_brain(
+        self, wired_loop, stub_brain, stub_dispatcher, brain_result
+    ):
+        """Full pipeline with stub brain and dispatcher; task is logged."""
+        category = brain_result.intent.category
+        stub_brain.result = brain_result
+        stub_dispatcher.results = [ActionResult(0, success=True)]
+
+        wired_loop.start_conversation()
+        result = wired_loop.process_text(brain_result.intent.raw_text)
+
+        assert result["response_text"] == brain_result.response_text
         assert result["model_used"] == "haiku"
-        assert result["intent"] == "greeting"
+        assert result["intent"] == category.value
         assert result["actions_executed"] == 1
 
-    def test_process_text_logs_task(self, soul_loop):
-        """Verify interaction is logged in task history."""
-        mock_brain = MagicMock()
-        mock_brain.process.return_value = InteractionResult(
-            intent=Intent(IntentCategory.SIMPLE_CHAT, raw_text="How's the weather?"),
-            response_text="It's a lovely day!",
-            action_plan=ActionPlan.speak_only("It's a lovely day!"),
-            model_used="haiku",
-        )
-        soul_loop._brain = mock_brain
-
-        mock_dispatcher = MagicMock()
-        mock_dispatcher.execute.return_value = []
-        mock_dispatcher.speaker = MagicMock()
-        soul_loop._dispatcher = mock_dispatcher
-
-        soul_loop.process_text("How's the weather?")
-
-        tasks = soul_loop.task_logger.recent_tasks()
+        tasks = wired_loop.task_logger.recent_tasks()
         assert len(tasks) == 1
-        assert tasks[0]["task_type"] == "simple_chat"
+        assert tasks[0]["task_type"] == category.value
 
-    def test_process_text_with_interim_response(self, soul_loop):
+    def test_process_text_with_interim_response(
+        self, wired_loop, stub_brain, stub_dispatcher
+    ):
         """Interim response should be spoken before main actions."""
-        mock_brain = MagicMock()
-        mock_brain.process.return_value = InteractionResult(
-            intent=Intent(IntentCategory.COMPLEX_PLAN, raw_text="Get my glasses"),
-            response_text="I'll get your glasses from room 204.",
-            action_plan=ActionPlan(actions=[
-                Action(ActionType.SPEAK, {"text": "On my way!"}),
-                Action(ActionType.NAVIGATE, {"destination": "room_204"}, depends_on=[0]),
-            ]),
-            model_used="sonnet",
-            interim_response="Sure, let me get your glasses!",
-        )
-        soul_loop._brain = mock_brain
-
-        mock_dispatcher = MagicMock()
-        mock_dispatcher.execute.return_value = [MagicMock(success=True), MagicMock(success=True)]
-        soul_loop._dispatcher = mock_dispatcher
-
-        result = soul_loop.process_text("Get my glasses")
-
-        mock_dispatcher.speak.assert_called_once_with("Sure, let me get your glasses!")
+        stub_brain.result = _GLASSES_RESULT
+        stub_dispatcher.results = [
+            ActionResult(0, success=True),
+            ActionResult(1, success=True),
+        ]
+
+        result = wired_loop.process_text("Get my glasses")
+
+        assert stub_dispatcher.speak_calls == ["Sure, let me get your glasses!"]
         assert result["actions_executed"] == 2
 
     def test_shutdown(self, soul_loop):
@@ -127,26 +168,43 @@ class TestSoulLoop:
         soul_loop.shutdown()
         assert soul_loop._running is False
 
-    def test_conversation_messages_logged(self, soul_loop):
+    def test_unreferenced_loop_closes_store(self, soul_config):
+        loop = SoulLoop(soul_config)
+        store = loop.store
+        loop.residents.create(name="Martha")
+        assert store._local.conn is not None
+        del loop
+        gc.collect()
+        assert store._local.conn is None
+
+    def test_stt_built_at_startup(self, soul_config):
+        """Whisper is constructed in __init__ so its model preloads during
+        start-up; _get_stt() then uses that same instance."""
+        soul_config.stt_enabled = True
+        with patch("soul.stt.whisper_stt.WhisperSTT") as whisper_cls:
+            loop = SoulLoop(soul_config)
+            whisper_cls.assert_called_once()
+            assert loop._get_stt() is whisper_cls.return_value
+            whisper_cls.assert_called_once()
+        loop.shutdown()
+        whisper_cls.return_value.close.assert_called_once()
+
+    def test_shutdown_runs_finalizer_once(self, soul_config):
+        loop = SoulLoop(soul_config)
+        loop.residents.create(name="Martha")
+        loop.shutdown()
+        assert loop.store._local.conn is None
+        # Disarmed, so GC / interpreter exit does not close the store again
+        assert not loop._finalizer.alive
+
+    def test_conversation_messages_logged(self, wired_loop, stub_brain):
         """Messages in active conversation should be logged."""
-        mock_brain = MagicMock()
-        mock_brain.process.return_value = InteractionResult(
-            intent=Intent(IntentCategory.GREETING, raw_text="Hi"),
-            response_text="Hello!",
-            action_plan=ActionPlan.speak_only("Hello!"),
-            model_used="haiku",
-        )
-        soul_loop._brain = mock_brain
-
-        mock_dispatcher = MagicMock()
-        mock_dispatcher.execute.return_value = []
-        mock_dispatcher.speaker = MagicMock()
-        soul_loop._dispatcher = mock_dispatcher
+        stub_brain.result = _HI_RESULT
 
-        cid = soul_loop.start_conversation()
-        soul_loop.process_text("Hi")
+        cid = wired_loop.start_conversation()
+        wired_loop.process_text("Hi")
 
-        messages = soul_loop.task_logger.get_conversation_messages(cid)
+        messages = wired_loop.task_logger.get_conversation_messages(cid)
         assert len(messages) == 2
         assert messages[0]["role"] == "user"
         assert messages[0]["content"] == "Hi"
@@ -155,27 +213,48 @@ class TestSoulLoop:
 
 
 class TestMemoryPersistence:
-    """Test that memory persists across SoulLoop instances."""
+    """Test that memory persists after a SoulLoop shuts down.
+
+    Uses a real database file: the shared in-memory test database would
+    outlive the loops regardless. Persistence lives in the store layer, so
+    most tests reopen just a SoulStore rather than a second SoulLoop.
+    """
+
+    @pytest.fixture
+    def soul_config(self, soul_config, disk_db_path):
+        soul_config.db_path = disk_db_path
+        return soul_config
 
     def test_resident_persists(self, soul_config):
-        loop1 = SoulLoop(soul_config)
-        rid = loop1.residents.create(name="Martha", room="204")
-        loop1.shutdown()
+        loop = SoulLoop(soul_config)
+        rid = loop.residents.create(name="Martha", room="204")
+        loop.shutdown()
 
-        loop2 = SoulLoop(soul_config)
-        r = loop2.residents.get(rid)
+        s = SoulStore(db_path=soul_config.db_path)
+        r = ResidentManager(s).get(rid)
         assert r is not None
         assert r["name"] == "Martha"
-        loop2.shutdown()
+        s.close()
 
     def test_preferences_persist(self, soul_config):
+        loop = SoulLoop(soul_config)
+        rid = loop.residents.create(name="Hans")
+        loop.preferences.set(rid, "drink", "coffee", "black")
+        loop.shutdown()
+
+        s = SoulStore(db_path=soul_config.db_path)
+        pref = PreferenceManager(s).get(rid, "drink", "coffee")
+        assert pref is not None
+        assert pref["value"] == "black"
+        s.close()
+
+    def test_reopened_loop_sees_memory(self, soul_config):
         loop1 = SoulLoop(soul_config)
-        rid = loop1.residents.create(name="Hans")
-        loop1.preferences.set(rid, "drink", "coffee", "black")
+        rid = loop1.residents.create(name="Martha", room="204")
         loop1.shutdown()
 
         loop2 = SoulLoop(soul_config)
-        pref = loop2.preferences.get(rid, "drink", "coffee")
-        assert pref is not None
-        assert pref["value"] == "black"
+        r = loop2.residents.get(rid)
+        assert r is not None
+        assert r["name"] == "Martha"
         loop2.shutdown()
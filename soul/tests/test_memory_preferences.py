@@ -3,7 +3,7 @@
 
 class TestPreferenceManager:
     def test_set_new_preference(self, preferences, sample_resident):
-        pid = preferences.set(sample_resident, "drink", "tea", "chamomile")
+        preferences.set(sample_resident, "drink", "tea", "chamomile")
         pref = preferences.get(sample_resident, "drink", "tea")
         assert pref is not None
         assert pref["value"] == "chamomile"
@@ -32,18 +32,12 @@ class TestPreferenceManager:
         pref = preferences.get(sample_resident, "drink", "tea")
         assert pref["value"] == "earl grey"
 
-    def test_list_for_resident(self, preferences, sample_resident):
-        preferences.set(sample_resident, "drink", "tea", "chamomile")
-        preferences.set(sample_resident, "food", "snack", "biscuits")
-        preferences.set(sample_resident, "activity", "hobby", "gardening")
-        prefs = preferences.list_for_resident(sample_resident)
-        assert len(prefs) == 3
+    def test_list_for_resident(self, preferences, seeded_prefs):
+        prefs = preferences.list_for_resident(seeded_prefs)
+        assert len(prefs) == 4
 
-    def test_list_by_category(self, preferences, sample_resident):
-        preferences.set(sample_resident, "food", "breakfast", "oatmeal")
-        preferences.set(sample_resident, "food", "snack", "biscuits")
-        preferences.set(sample_resident, "drink", "tea", "chamomile")
-        prefs = preferences.list_for_resident(sample_resident, category="food")
+    def test_list_by_category(self, preferences, seeded_prefs):
+        prefs = preferences.list_for_resident(seeded_prefs, category="food")
         assert len(prefs) == 2
 
     def test_list_with_min_confidence(self, preferences, sample_resident):
@@ -69,12 +63,8 @@ class TestPreferenceManager:
         preferences.delete(pid)
         assert preferences.get(sample_resident, "drink", "tea") is None
 
-    def test_build_preferences_context(self, preferences, sample_resident):
-        preferences.set(sample_resident, "drink", "tea", "chamomile", confidence=0.9)
-        preferences.set(sample_resident, "food", "snack", "biscuits", confidence=0.7)
-        preferences.set(sample_resident, "activity", "hobby", "gardening", confidence=0.3)
-
-        ctx = preferences.build_preferences_context(sample_resident, min_confidence=0.3)
+    def test_build_preferences_context(self, preferences, seeded_prefs):
+        ctx = preferences.build_preferences_context(seeded_prefs, min_confidence=0.3)
         assert "Preferences:" in ctx
         assert "chamomile" in ctx
         assert "biscuits" in ctx
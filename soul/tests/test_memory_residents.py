@@ -61,10 +61,19 @@ class TestResidentManager:
         prefs = preferences.list_for_resident(rid)
         assert len(prefs) == 0
 
-    def test_build_context(self, residents, preferences, task_logger):
-        rid = residents.create(name="Martha", room="204", notes="Loves gardening")
-        preferences.set(rid, "drink", "tea", "chamomile", confidence=0.9)
-        preferences.set(rid, "activity", "hobby", "gardening", confidence=0.95)
+    def test_delete_with_history_resets_deferred_fks(self, residents, task_logger, store):
+        rid = residents.create(name="Martha")
+        cid = task_logger.start_conversation(rid)
+        task_logger.add_message(cid, "user", "Hello")
+        task_logger.log_task("chat", "Said hello", resident_id=rid)
+        residents.delete(rid)
+        assert residents.get(rid) is None
+        assert task_logger.get_conversation_messages(cid) == []
+        fk = store._conn.execute("PRAGMA defer_foreign_keys").fetchone()
+        assert fk[0] == 0
+
+    def test_build_context(self, residents, seeded_prefs, task_logger):
+        rid = seeded_prefs  # Martha, room 204
         task_logger.log_task("fetch", "Brought glasses from room", resident_id=rid)
 
         ctx = residents.build_context(rid)
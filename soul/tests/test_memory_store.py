@@ -1,15 +1,21 @@
 """Tests for SoulStore — SQLite schema, migrations, thread safety."""
 
+import sqlite3
 import threading
 
+import pytest
+
 from soul.memory.store import SoulStore
 
 
 class TestSoulStore:
-    def test_creates_tables(self, store):
-        tables = store._conn.execute(
+    def test_creates_tables(self):
+        # A fresh store, so the migrations themselves run (not a template copy)
+        s = SoulStore(db_path=":memory:")
+        tables = s._conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         ).fetchall()
+        s.close()
         table_names = {t["name"] for t in tables}
         assert "residents" in table_names
         assert "preferences" in table_names
@@ -22,7 +28,7 @@ class TestSoulStore:
 
     def test_schema_version(self, store):
         row = store._conn.execute("SELECT version FROM schema_version").fetchone()
-        assert row["version"] == 2
+        assert row["version"] == 5
 
     def test_idempotent_migration(self, db_path):
         """Running migration twice doesn't error."""
@@ -30,17 +36,103 @@ class TestSoulStore:
         s1.close()
         s2 = SoulStore(db_path=db_path)
         row = s2._conn.execute("SELECT version FROM schema_version").fetchone()
-        assert row["version"] == 2
+        assert row["version"] == 5
         s2.close()
 
+    def test_failed_migration_rolls_back(self):
+        s = SoulStore(db_path=":memory:")
+        c = s._conn
+        # Pretend to be at v2, but with the v4 column already present so
+        # the v4 step fails after the v3 step has run
+        c.execute("DROP INDEX idx_task_history_resident_time")
+        c.execute("UPDATE schema_version SET version = 2")
+        c.commit()
+        with pytest.raises(sqlite3.OperationalError):
+            s._migrate()
+        assert c.execute("SELECT version FROM schema_version").fetchone()[0] == 2
+        assert c.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_task_history_resident_time'"
+        ).fetchone() is None
+        s.close()
+
+    def test_recent_tasks_uses_composite_index(self, store):
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM task_history WHERE resident_id = ? "
+            "ORDER BY started_at DESC LIMIT 5",
+            ("r1",),
+        ).fetchall()
+        detail = " ".join(row["detail"] for row in plan)
+        assert "idx_task_history_resident_time" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_from_template_copies_schema(self, store):
+        s = SoulStore.from_template(store._conn)
+        row = s._conn.execute("SELECT version FROM schema_version").fetchone()
+        assert row["version"] == 5
+        s._conn.execute("INSERT INTO residents (id, name) VALUES ('r1', 'Ada')")
+        s._conn.commit()
+        # The copy is independent of the template
+        assert store._conn.execute("SELECT COUNT(*) FROM residents").fetchone()[0] == 0
+        s.close()
+
+    @pytest.mark.on_disk
     def test_wal_mode(self, store):
         mode = store._conn.execute("PRAGMA journal_mode").fetchone()
         assert mode[0] == "wal"
 
+    def test_durable_by_default(self, tmp_path):
+        s = SoulStore(db_path=str(tmp_path / "durable.db"))
+        # FULL (2) or NORMAL (1) depending on the SQLite build; never OFF
+        assert s._conn.execute("PRAGMA synchronous").fetchone()[0] > 0
+        s.close()
+
+    def test_in_memory_skips_wal_and_fsync(self):
+        s = SoulStore(db_path=":memory:")
+        assert s._conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        assert s._conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        s.close()
+
+    @pytest.mark.parametrize(
+        "db_path",
+        ["file:soul-uri-test?mode=memory&cache=shared", "file::memory:?cache=shared"],
+    )
+    def test_memory_uri_skips_wal_and_fsync(self, db_path):
+        s = SoulStore(db_path=db_path)
+        assert s._in_memory
+        assert s._conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        assert s._conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        s.close()
+
+    def test_file_uri_is_not_in_memory(self, tmp_path):
+        s = SoulStore(db_path=f"file:{tmp_path / 'soul.db'}?cache=shared")
+        assert not s._in_memory
+        assert s._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        s.close()
+
+    def test_non_durable_skips_fsync(self, store):
+        assert store._conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        assert store._conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
     def test_foreign_keys_enabled(self, store):
         fk = store._conn.execute("PRAGMA foreign_keys").fetchone()
         assert fk[0] == 1
 
+    def test_analyze_stats_persisted(self, store):
+        tables = store._conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchall()
+        assert len(tables) == 1
+
+    def test_reopen_skips_analyze(self, disk_db_path):
+        """ANALYZE runs only when migrations were applied, not on every open."""
+        s1 = SoulStore(db_path=disk_db_path)
+        s1._conn.execute("DELETE FROM sqlite_stat1")
+        s1._conn.commit()
+        s1._conn.close()  # not close(): PRAGMA optimize may re-analyze
+        s2 = SoulStore(db_path=disk_db_path)
+        assert s2._conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] == 0
+        s2.close()
+
     def test_new_id_format(self, store):
         id1 = store._new_id()
         id2 = store._new_id()
@@ -71,19 +163,22 @@ class TestSoulStore:
         row = store._conn.execute("SELECT * FROM residents WHERE id = 'test2'").fetchone()
         assert row is None
 
+    # Shared-cache memory databases fail concurrent writers with "table is
+    # locked" instead of waiting; a file honours the busy timeout
+    @pytest.mark.on_disk
     def test_thread_safety(self, db_path):
         """Each thread gets its own connection."""
         store = SoulStore(db_path=db_path)
         results = []
 
         def worker(name):
-            rid = store._new_id()
+            rids = [store._new_id() for _ in range(20)]
             with store._transaction():
-                store._conn.execute(
+                store._conn.executemany(
                     "INSERT INTO residents (id, name) VALUES (?, ?)",
-                    (rid, name),
+                    [(rid, name) for rid in rids],
                 )
-            results.append(rid)
+            results.extend(rids)
 
         threads = [threading.Thread(target=worker, args=(f"T{i}",)) for i in range(5)]
         for t in threads:
@@ -91,9 +186,9 @@ class TestSoulStore:
         for t in threads:
             t.join()
 
-        assert len(results) == 5
+        assert len(results) == 5 * 20
         rows = store._conn.execute("SELECT COUNT(*) as cnt FROM residents").fetchone()
-        assert rows["cnt"] == 5
+        assert rows["cnt"] == 5 * 20
         store.close()
 
     def test_close(self, db_path):
@@ -4,178 +4,159 @@ Covers 30+ utterances across all IntentCategory values, plus entity
 extraction and confidence scoring.
 """
 
+import re
+
 import pytest
 
-from soul.cognition.router import classify, _extract_item, _extract_location
+from soul.cognition.router import _extract_item, _extract_location, classify, classify_many
 from soul.cognition.schemas import IntentCategory
 
 
-# =========================================================================
-# Emergency detection — highest priority, safety-critical
-# =========================================================================
-
-class TestEmergency:
-    """Emergency keywords must always be detected, regardless of context."""
-
-    @pytest.mark.parametrize("utterance", [
-        "Help!",
-        "I've fallen and I can't get up",
-        "I'm in pain",
-        "This is an emergency",
-        "I think I'm having a heart attack",
-        "I hurt my arm",
-        "Call the nurse please",
-        "I feel dizzy",
-        "I can't breathe",
-        "Someone call 911",
-    ])
-    def test_emergency_detected(self, utterance):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.EMERGENCY
-        assert intent.confidence >= 0.9
-        assert "trigger" in intent.entities
-
-    def test_emergency_has_raw_text(self):
-        intent = classify("Help me I fell!")
-        assert intent.raw_text == "Help me I fell!"
+_EMERGENCY_CASES = (
+    "Help!",
+    "I've fallen and I can't get up",
+    "I'm in pain",
+    "This is an emergency",
+    "I think I'm having a heart attack",
+    "I hurt my arm",
+    "Call the nurse please",
+    "I feel dizzy",
+    "I can't breathe",
+    "Someone call 911",
+)
+
+_GREETING_CASES = (
+    "Hello!",
+    "Hi there",
+    "Good morning",
+    "Good afternoon, how are you?",
+    "Hey Wybe",
+    "Nice to see you",
+)
+
+_FAREWELL_CASES = (
+    "Goodbye",
+    "Bye bye",
+    "See you later",
+    "Good night",
+    "Take care",
+)
+
+# (utterance, expected location)
+_NAVIGATE_CASES = (
+    ("Take me to the dining hall", "dining hall"),
+    ("Can you go to the garden?", "garden"),
+    ("Where is the lobby?", "lobby"),
+    ("Navigate to room 204", "room 204"),
+)
+
+# (utterance, expected item)
+_ITEM_CASES = (
+    ("Bring me my glasses", "glasses"),
+    ("Can you get me a glass of water?", "glass of water"),
+    ("I need my medication", "medication"),
+    ("Fetch my book please", "book"),
+)
+
+_PREFERENCE_CASES = (
+    "I like chamomile tea",
+    "I love watching the birds",
+    "I prefer the window seat",
+    "My favorite show is Jeopardy",
+    "I always have coffee in the morning",
+    "I don't like loud music",
+)
+
+_INFORMATION_CASES = (
+    "What time is it?",
+    "What's for lunch today?",
+    "What activities are planned?",
+    "When is bingo?",
+    "What day is it?",
+)
+
+_SIMPLE_CHAT_CASES = (
+    "Thank you so much",
+    "Yes please",
+    "That's lovely",
+    "Tell me a joke",
+)
+
+# (utterance, expected category, minimum confidence) — one row per utterance
+ROUTER_CASES = [
+    *((u, IntentCategory.EMERGENCY, 0.9) for u in _EMERGENCY_CASES),
+    *((u, IntentCategory.GREETING, 0.8) for u in _GREETING_CASES),
+    *((u, IntentCategory.FAREWELL, 0.8) for u in _FAREWELL_CASES),
+    *((u, IntentCategory.REQUEST_NAVIGATE, 0.8) for u, _ in _NAVIGATE_CASES),
+    *((u, IntentCategory.REQUEST_ITEM, 0.8) for u, _ in _ITEM_CASES),
+    *((u, IntentCategory.PREFERENCE, 0.7) for u in _PREFERENCE_CASES),
+    *((u, IntentCategory.INFORMATION, 0.7) for u in _INFORMATION_CASES),
+    *((u, IntentCategory.SIMPLE_CHAT, 0.6) for u in _SIMPLE_CHAT_CASES),
+]
 
 
 # =========================================================================
-# Greetings
+# Category detection — every category in one table
 # =========================================================================
 
-class TestGreeting:
-
-    @pytest.mark.parametrize("utterance", [
-        "Hello!",
-        "Hi there",
-        "Good morning",
-        "Good afternoon, how are you?",
-        "Hey Wybe",
-        "Nice to see you",
-    ])
-    def test_greeting_detected(self, utterance):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.GREETING
-        assert intent.confidence >= 0.8
-
-
-# =========================================================================
-# Farewells
-# =========================================================================
-
-class TestFarewell:
-
-    @pytest.mark.parametrize("utterance", [
-        "Goodbye",
-        "Bye bye",
-        "See you later",
-        "Good night",
-        "Take care",
-    ])
-    def test_farewell_detected(self, utterance):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.FAREWELL
-        assert intent.confidence >= 0.8
-
+@pytest.mark.parametrize("utterance,expected_cat,min_conf", ROUTER_CASES)
+def test_classify(utterance, expected_cat, min_conf):
+    intent = classify(utterance)
+    assert intent.category == expected_cat
+    assert intent.confidence >= min_conf
 
-# =========================================================================
-# Navigation requests
-# =========================================================================
 
-class TestNavigate:
-
-    @pytest.mark.parametrize("utterance,expected_location", [
-        ("Take me to the dining hall", "dining hall"),
-        ("Can you go to the garden?", "garden"),
-        ("Where is the lobby?", "lobby"),
-        ("Navigate to room 204", "room 204"),
-    ])
-    def test_navigate_detected(self, utterance, expected_location):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.REQUEST_NAVIGATE
-        assert intent.confidence >= 0.8
-        if expected_location:
-            assert "location" in intent.entities
-            assert expected_location.lower() in intent.entities["location"].lower()
+def test_classify_many_matches_table():
+    intents = classify_many(u for u, _, _ in ROUTER_CASES)
+    assert [i.category for i in intents] == [c for _, c, _ in ROUTER_CASES]
 
 
 # =========================================================================
-# Item requests
+# Emergency detection — highest priority, safety-critical
 # =========================================================================
 
-class TestRequestItem:
+class TestEmergency:
+    """Emergency keywords must always be detected, regardless of context."""
 
-    @pytest.mark.parametrize("utterance,expected_item", [
-        ("Bring me my glasses", "glasses"),
-        ("Can you get me a glass of water?", "glass of water"),
-        ("I need my medication", "medication"),
-        ("Fetch my book please", "book"),
-    ])
-    def test_item_request_detected(self, utterance, expected_item):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.REQUEST_ITEM
-        assert intent.confidence >= 0.8
-        if expected_item:
-            assert "item" in intent.entities
-            assert expected_item.lower() in intent.entities["item"].lower()
+    @pytest.mark.parametrize("utterance", _EMERGENCY_CASES)
+    def test_emergency_has_trigger(self, utterance):
+        assert "trigger" in classify(utterance).entities
 
+    def test_emergency_batch(self):
+        intents = classify_many(_EMERGENCY_CASES)
+        assert len(intents) == len(_EMERGENCY_CASES)
+        assert all(i.category == IntentCategory.EMERGENCY for i in intents)
+        assert [i.raw_text for i in intents] == list(_EMERGENCY_CASES)
 
-# =========================================================================
-# Preferences
-# =========================================================================
+    def test_emergency_trigger_is_most_specific_keyword(self):
+        assert classify("I can't breathe").entities["trigger"] == "can't breathe"
+        assert classify("Heart attack!").entities["trigger"] == "heart attack"
 
-class TestPreference:
+    def test_emergency_has_raw_text(self):
+        intent = classify("Help me I fell!")
+        assert intent.raw_text == "Help me I fell!"
 
-    @pytest.mark.parametrize("utterance", [
-        "I like chamomile tea",
-        "I love watching the birds",
-        "I prefer the window seat",
-        "My favorite show is Jeopardy",
-        "I always have coffee in the morning",
-        "I don't like loud music",
-    ])
-    def test_preference_detected(self, utterance):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.PREFERENCE
-        assert intent.confidence >= 0.7
+    def test_batch_matches_single(self):
+        texts = _GREETING_CASES + _EMERGENCY_CASES
+        assert classify_many(texts) == [classify(t) for t in texts]
+        assert classify_many(iter(texts)) == classify_many(texts)
+        assert classify_many([]) == []
 
 
 # =========================================================================
-# Information requests
+# Entities on navigation / item requests
 # =========================================================================
 
-class TestInformation:
-
-    @pytest.mark.parametrize("utterance", [
-        "What time is it?",
-        "What's for lunch today?",
-        "What activities are planned?",
-        "When is bingo?",
-        "What day is it?",
-    ])
-    def test_information_detected(self, utterance):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.INFORMATION
-        assert intent.confidence >= 0.7
+@pytest.mark.parametrize("utterance,expected_location", _NAVIGATE_CASES)
+def test_navigate_location(utterance, expected_location):
+    intent = classify(utterance)
+    assert expected_location in intent.entities["location"].lower()
 
 
-# =========================================================================
-# Simple chat
-# =========================================================================
-
-class TestSimpleChat:
-
-    @pytest.mark.parametrize("utterance", [
-        "Thank you so much",
-        "Yes please",
-        "That's lovely",
-        "Tell me a joke",
-    ])
-    def test_simple_chat_detected(self, utterance):
-        intent = classify(utterance)
-        assert intent.category == IntentCategory.SIMPLE_CHAT
-        assert intent.confidence >= 0.6
+@pytest.mark.parametrize("utterance,expected_item", _ITEM_CASES)
+def test_item_entity(utterance, expected_item):
+    intent = classify(utterance)
+    assert expected_item in intent.entities["item"].lower()
 
 
 # =========================================================================
@@ -271,3 +252,14 @@ class TestEdgeCases:
     def test_case_insensitive_emergency(self):
         intent = classify("HELP ME!")
         assert intent.category == IntentCategory.EMERGENCY
+
+    def test_no_regex_compiled_per_call(self, monkeypatch):
+        """All matchers are compiled at import; classify() only searches."""
+        def _fail(*args, **kwargs):
+            raise AssertionError("regex compiled during classify()")
+
+        # re.compile/re.search/... all funnel through re._compile
+        monkeypatch.setattr(re, "_compile", _fail)
+        for utterance, _, _ in ROUTER_CASES:
+            classify(utterance)
+        classify("Tell Martha I'll be late")
@@ -1,15 +1,18 @@
 """Tests for SpeakerIdentifier — embedding storage, cosine similarity, enrollment."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 
-from soul.memory.store import SoulStore
+from soul.memory.store import _SCHEMA_VERSION, SoulStore
 from soul.stt.speaker_id import (
     SpeakerIdentifier,
     _blob_to_floats,
     _cosine_similarity,
+    _dequantize_blob,
     _floats_to_blob,
+    _quantize_to_blob,
 )
 
 
@@ -24,6 +27,7 @@ class TestHelpers:
         original = [1.0, 2.5, -0.3, 0.0, 99.9]
         blob = _floats_to_blob(original)
         restored = _blob_to_floats(blob)
+        assert restored.dtype == np.float32
         assert len(restored) == len(original)
         for a, b in zip(original, restored):
             assert abs(a - b) < 1e-5
@@ -48,6 +52,28 @@ class TestHelpers:
     def test_cosine_similarity_zero_vector(self):
         assert _cosine_similarity([0.0, 0.0], [1.0, 2.0]) == 0.0
 
+    def test_cosine_similarity_accepts_arrays(self):
+        a = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+        score = _cosine_similarity(a, [2.0, 4.0, 6.0])
+        assert isinstance(score, float)
+        assert abs(score - 1.0) < 1e-6
+
+    def test_quantized_blob_roundtrip(self):
+        rng = np.random.default_rng(0)
+        a, b = rng.standard_normal((2, 256)).astype(np.float32)
+        blob = _quantize_to_blob(a)
+        assert len(blob) == 4 + 256
+        restored = _dequantize_blob(blob)
+        assert restored.dtype == np.float32
+        assert abs(_cosine_similarity(restored, a) - 1.0) < 1e-3
+        drift = _cosine_similarity(restored, _dequantize_blob(_quantize_to_blob(b))) - (
+            _cosine_similarity(a, b)
+        )
+        assert abs(drift) < 0.01
+
+    def test_quantize_zero_vector(self):
+        assert not _dequantize_blob(_quantize_to_blob([0.0] * 8)).any()
+
 
 # =========================================================================
 # Schema — speaker_embeddings table exists
@@ -62,16 +88,71 @@ class TestSpeakerEmbeddingsSchema:
         ).fetchall()
         assert len(tables) == 1
 
+    def test_enroll_stores_int8(self, store):
+        rid = store._new_id()
+        store._conn.execute("INSERT INTO residents (id, name) VALUES (?, ?)", (rid, "Martha"))
+        store._conn.commit()
+        sid = SpeakerIdentifier(store)
+        with patch.object(sid, "extract_embedding", return_value=[0.5] * 256):
+            sid.enroll(rid, b"sample")
+        row = store._conn.execute("SELECT embedding, encoding FROM speaker_embeddings").fetchone()
+        assert row["encoding"] == "q8"
+        assert len(row["embedding"]) == 4 + 256
+        # Stored already L2-normalized
+        assert np.linalg.norm(_dequantize_blob(row["embedding"])) == pytest.approx(1.0, abs=1e-2)
+
+    def test_legacy_float32_rows_still_match(self, store):
+        rid = store._new_id()
+        store._conn.execute("INSERT INTO residents (id, name) VALUES (?, ?)", (rid, "Martha"))
+        emb = [1.0, 0.0, 0.0] + [0.0] * 253
+        # Rows written before v4 carry raw float32 blobs and the default encoding
+        store._conn.execute(
+            "INSERT INTO speaker_embeddings (id, resident_id, embedding) VALUES (?, ?, ?)",
+            (store._new_id(), rid, _floats_to_blob(emb)),
+        )
+        store._conn.commit()
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        with patch.dict("sys.modules", {"faiss": None}):
+            with patch.object(sid, "extract_embedding", return_value=emb):
+                assert sid.identify(b"test") == rid
+
+    def test_v3_migration_marks_rows_float32(self):
+        s = SoulStore(db_path=":memory:")
+        c = s._conn
+        c.execute("ALTER TABLE speaker_embeddings DROP COLUMN encoding")
+        c.execute("UPDATE schema_version SET version = 3")
+        c.execute("INSERT INTO residents (id, name) VALUES ('r1', 'Martha')")
+        c.execute(
+            "INSERT INTO speaker_embeddings (id, resident_id, embedding) "
+            "VALUES ('e1', 'r1', ?)",
+            (_floats_to_blob([1.0, 0.0]),),
+        )
+        c.commit()
+        s._migrate()
+        assert c.execute("SELECT encoding FROM speaker_embeddings").fetchone()[0] == "f32"
+        assert c.execute("SELECT version FROM schema_version").fetchone()[0] == _SCHEMA_VERSION
+        assert c.execute("SELECT COUNT(*) FROM speaker_embeddings_version").fetchone()[0] == 1
+        s.close()
+
+    def test_resident_lookup_uses_index(self, store):
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT embedding FROM speaker_embeddings "
+            "WHERE resident_id = ?",
+            ("r1",),
+        ).fetchall()
+        assert "idx_speaker_emb_resident" in " ".join(row["detail"] for row in plan)
+
     def test_schema_version_is_2(self, store):
+        """speaker_embeddings arrived in v2; the store must be fully migrated."""
         row = store._conn.execute("SELECT version FROM schema_version").fetchone()
-        assert row["version"] == 2
+        assert row["version"] == _SCHEMA_VERSION
 
     def test_migration_idempotent(self, db_path):
         s1 = SoulStore(db_path=db_path)
         s1.close()
         s2 = SoulStore(db_path=db_path)
         row = s2._conn.execute("SELECT version FROM schema_version").fetchone()
-        assert row["version"] == 2
+        assert row["version"] == _SCHEMA_VERSION
         s2.close()
 
 
@@ -158,6 +239,26 @@ class TestSpeakerIdentifier:
             result = sid.enroll("some_id", b"fake_audio")
         assert result is False
 
+    def test_enroll_batch(self, store):
+        rid = store._new_id()
+        store._conn.execute("INSERT INTO residents (id, name) VALUES (?, ?)", (rid, "Martha"))
+        store._conn.commit()
+
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        embeddings = {
+            b"a": [1.0, 0.0] + [0.0] * 254,
+            b"b": None,  # extraction failure is skipped
+            b"c": [0.0, 1.0] + [0.0] * 254,
+        }
+        with patch.object(sid, "extract_embedding", side_effect=embeddings.get):
+            assert sid.enroll_batch(rid, [b"a", b"b", b"c"]) == 2
+            assert sid.enroll_batch(rid, [b"b"]) == 0
+
+        count = store._conn.execute(
+            "SELECT COUNT(*) FROM speaker_embeddings WHERE resident_id = ?", (rid,)
+        ).fetchone()[0]
+        assert count == 2
+
     def test_multiple_embeddings_per_resident(self, store):
         """Multiple voice samples for one resident — best match wins."""
         rid = store._new_id()
@@ -186,3 +287,139 @@ class TestSpeakerIdentifier:
         with patch.object(sid, "extract_embedding", return_value=query):
             result = sid.identify(b"test")
         assert result == rid
+
+    def test_identify_without_faiss_falls_back_to_scan(self, store):
+        rid = store._new_id()
+        store._conn.execute(
+            "INSERT INTO residents (id, name) VALUES (?, ?)", (rid, "Martha")
+        )
+        store._conn.commit()
+
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        emb = [1.0, 0.0, 0.0] + [0.0] * 253
+        with patch.dict("sys.modules", {"faiss": None}):
+            with patch.object(sid, "extract_embedding", return_value=emb):
+                sid.enroll(rid, b"sample")
+                result = sid.identify(b"test")
+        assert result == rid
+        assert sid._index is None
+
+    def test_scan_matrix_cached_and_reset_on_enroll(self, store):
+        rid1, rid2 = store._new_id(), store._new_id()
+        store._conn.executemany(
+            "INSERT INTO residents (id, name) VALUES (?, ?)",
+            [(rid1, "Martha"), (rid2, "Hans")],
+        )
+        store._conn.commit()
+
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        emb1 = [1.0, 0.0, 0.0] + [0.0] * 253
+        emb2 = [0.0, 1.0, 0.0] + [0.0] * 253
+        with patch.dict("sys.modules", {"faiss": None}):
+            with patch.object(sid, "extract_embedding", return_value=emb1):
+                sid.enroll(rid1, b"sample1")
+                assert sid.identify(b"test") == rid1
+            matrix = sid._matrix
+            assert matrix.shape == (1, 256)
+            assert np.linalg.norm(matrix, axis=1) == pytest.approx([1.0])
+            # One contiguous float32 block, so scoring is a single BLAS sgemv
+            assert matrix.dtype == np.float32 and matrix.flags.c_contiguous
+
+            with patch.object(sid, "extract_embedding", return_value=emb2):
+                sid.enroll(rid2, b"sample2")
+                assert sid._matrix is None
+                assert sid.identify(b"test") == rid2
+            assert sid._matrix.shape == (2, 256)
+
+            # Wrong-dimension query never matches
+            with patch.object(sid, "extract_embedding", return_value=[1.0, 0.0]):
+                assert sid.identify(b"test") is None
+
+    def test_scan_matrix_rebuilt_after_external_change(self, store):
+        rid1, rid2 = store._new_id(), store._new_id()
+        store._conn.executemany(
+            "INSERT INTO residents (id, name) VALUES (?, ?)",
+            [(rid1, "Martha"), (rid2, "Hans")],
+        )
+        store._conn.commit()
+
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        emb1 = [1.0, 0.0, 0.0] + [0.0] * 253
+        emb2 = [0.0, 1.0, 0.0] + [0.0] * 253
+        with patch.dict("sys.modules", {"faiss": None}):
+            with patch.object(sid, "extract_embedding", return_value=emb1):
+                sid.enroll(rid1, b"sample1")
+                assert sid.identify(b"test") == rid1
+                matrix = sid._matrix
+                assert sid.identify(b"test") == rid1
+                assert sid._matrix is matrix
+
+            # Another identifier (e.g. another process) enrolls Hans
+            other = SpeakerIdentifier(store, threshold=0.5)
+            with patch.object(other, "extract_embedding", return_value=emb2):
+                other.enroll(rid2, b"sample2")
+            with patch.object(sid, "extract_embedding", return_value=emb2):
+                assert sid.identify(b"test") == rid2
+
+            # Deleted embeddings stop matching
+            store._conn.execute("DELETE FROM speaker_embeddings WHERE resident_id = ?", (rid1,))
+            store._conn.commit()
+            with patch.object(sid, "extract_embedding", return_value=emb1):
+                assert sid.identify(b"test") is None
+
+    def test_scan_matrix_rebuilt_when_newest_row_replaced(self, store):
+        """Deleting the newest embedding frees its rowid for the next insert;
+        the cache must still notice the change."""
+        rid_a, rid_b, rid_c = store._new_id(), store._new_id(), store._new_id()
+        store._conn.executemany(
+            "INSERT INTO residents (id, name) VALUES (?, ?)",
+            [(rid_a, "Martha"), (rid_b, "Hans"), (rid_c, "Ingrid")],
+        )
+        store._conn.commit()
+
+        emb_a = [1.0, 0.0, 0.0] + [0.0] * 253
+        emb_b = [0.0, 1.0, 0.0] + [0.0] * 253
+        emb_c = [0.0, 0.0, 1.0] + [0.0] * 253
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        with patch.dict("sys.modules", {"faiss": None}):
+            with patch.object(sid, "extract_embedding", side_effect=[emb_a, emb_b]):
+                sid.enroll(rid_a, b"a")
+                sid.enroll(rid_b, b"b")
+            with patch.object(sid, "extract_embedding", return_value=emb_b):
+                assert sid.identify(b"b") == rid_b
+
+            store._conn.execute("DELETE FROM speaker_embeddings WHERE resident_id = ?", (rid_b,))
+            store._conn.execute("DELETE FROM residents WHERE id = ?", (rid_b,))
+            store._conn.commit()
+            other = SpeakerIdentifier(store, threshold=0.5)
+            with patch.object(other, "extract_embedding", return_value=emb_c):
+                other.enroll(rid_c, b"c")
+
+            with patch.object(sid, "extract_embedding", return_value=emb_b):
+                assert sid.identify(b"b") is None
+            with patch.object(sid, "extract_embedding", return_value=emb_c):
+                assert sid.identify(b"c") == rid_c
+
+    def test_index_updated_on_enroll(self, store):
+        pytest.importorskip("faiss")
+        rid1, rid2 = store._new_id(), store._new_id()
+        store._conn.executemany(
+            "INSERT INTO residents (id, name) VALUES (?, ?)",
+            [(rid1, "Martha"), (rid2, "Hans")],
+        )
+        store._conn.commit()
+
+        sid = SpeakerIdentifier(store, threshold=0.5)
+        emb1 = [1.0, 0.0, 0.0] + [0.0] * 253
+        emb2 = [0.0, 1.0, 0.0] + [0.0] * 253
+
+        with patch.object(sid, "extract_embedding", return_value=emb1):
+            sid.enroll(rid1, b"sample1")
+            assert sid.identify(b"test") == rid1
+        assert sid._index.ntotal == 1
+
+        # Enrolling after the index is built appends instead of rebuilding
+        with patch.object(sid, "extract_embedding", return_value=emb2):
+            sid.enroll(rid2, b"sample2")
+            assert sid.identify(b"test") == rid2
+        assert sid._index.ntotal == 2
@@ -1,11 +1,31 @@
 """Tests for STT layer — text fallback and Whisper (mocked)."""
 
+from collections import namedtuple
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from soul.stt.base import Utterance
 from soul.stt.text_fallback import TextFallbackSTT
 
 
+_Segment = namedtuple("_Segment", ["text", "start", "end"])
+_Info = namedtuple("_Info", ["language", "language_probability"])
+
+
+class _FakeWhisperModel:
+    """Plugs into WhisperSTT(model=...): canned output, calls recorded."""
+
+    def __init__(self, segments, info):
+        self._segments = segments
+        self._info = info
+        self.calls: list[tuple] = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio, kwargs))
+        return iter(self._segments), self._info
+
+
 class TestTextFallbackSTT:
     def test_transcribe_text(self):
         stt = TextFallbackSTT()
@@ -19,6 +39,15 @@ class TestTextFallbackSTT:
         assert stt.transcribe(b"") is None
         assert stt.transcribe(b"   ") is None
 
+    def test_blank_input_not_cached(self):
+        from soul.stt.text_fallback import _decode
+
+        stt = TextFallbackSTT()
+        size = _decode.cache_info().currsize
+        for blank in (b"", b" ", b"\n\t  ", bytearray(b"  ")):
+            assert stt.transcribe(blank) is None
+        assert _decode.cache_info().currsize == size
+
     def test_is_available(self):
         stt = TextFallbackSTT()
         assert stt.is_available() is True
@@ -28,6 +57,12 @@ class TestTextFallbackSTT:
         result = stt.transcribe("Guten Tag!".encode("utf-8"))
         assert result.text == "Guten Tag!"
 
+    def test_repeat_input_is_cached(self):
+        stt = TextFallbackSTT()
+        first = stt.transcribe(b"Same words")
+        assert stt.transcribe(b"Same words") is first
+        assert TextFallbackSTT().transcribe(b"Same words") is first
+
 
 class TestUtterance:
     def test_defaults(self):
@@ -36,53 +71,399 @@ class TestUtterance:
         assert u.confidence == 1.0
         assert u.duration == 0.0
 
+    def test_frozen_and_hashable(self):
+        import dataclasses
+
+        u = Utterance(text="Hei", language="no")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            u.text = "Hallo"
+        assert hash(u) == hash(Utterance(text="Hei", language="no"))
+        assert not hasattr(u, "__dict__")
+
 
 class TestWhisperSTT:
     def test_is_available_no_package(self):
         """When faster-whisper is not installed, is_available returns False."""
         with patch.dict("sys.modules", {"faster_whisper": None}):
             from soul.stt.whisper_stt import WhisperSTT
-            stt = WhisperSTT()
+            stt = WhisperSTT(preload=False)
             # Reset cached model
             stt._model = None
             assert stt.is_available() is False
 
-    def test_transcribe_with_mock(self):
-        """Test transcription with a mocked WhisperModel."""
+    def test_default_compute_type_is_auto(self):
         from soul.stt.whisper_stt import WhisperSTT
 
-        stt = WhisperSTT()
+        assert WhisperSTT(preload=False)._compute_type == "auto"
 
-        mock_segment = MagicMock()
-        mock_segment.text = " Hello, how are you? "
-        mock_segment.end = 2.5
+    def test_compute_type_fallback_on_value_error(self):
+        """An unsupported compute_type falls back to float16, then float32."""
+        mock_fw = MagicMock()
+        loaded = MagicMock()
+        mock_fw.WhisperModel.side_effect = [
+            ValueError("int8 not supported"),
+            ValueError("float16 not supported"),
+            loaded,
+        ]
+        from soul.stt.whisper_stt import WhisperSTT, _load_whisper
 
-        mock_info = MagicMock()
-        mock_info.language = "en"
-        mock_info.language_probability = 0.98
+        _load_whisper.cache_clear()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            stt = WhisperSTT(compute_type="int8", preload=False)
+            assert stt._get_model() is loaded
+        _load_whisper.cache_clear()
 
-        mock_model = MagicMock()
-        mock_model.transcribe.return_value = ([mock_segment], mock_info)
-        stt._model = mock_model
+        tried = [c.kwargs["compute_type"] for c in mock_fw.WhisperModel.call_args_list]
+        assert tried == ["int8", "float16", "float32"]
+
+    @pytest.mark.parametrize(
+        ("device", "supported", "expected"),
+        [
+            ("cuda", {"int8", "int8_float16", "float16"}, "int8_float16"),
+            ("cuda", {"int8", "float16"}, "int8"),
+            ("cpu", {"int8", "float32"}, "int8"),
+            ("cpu", set(), "auto"),
+        ],
+    )
+    def test_auto_compute_type_resolved_per_device(self, device, supported, expected):
+        from soul.stt.whisper_stt import _resolve_compute_type
+
+        with patch(
+            "soul.stt.whisper_stt._supported_compute_types", return_value=supported
+        ):
+            assert _resolve_compute_type(device, "auto") == expected
+            assert _resolve_compute_type(device, "float32") == "float32"
+
+    def test_model_shared_across_instances(self):
+        mock_fw = MagicMock()
+        from soul.stt.whisper_stt import WhisperSTT, _load_whisper
+
+        _load_whisper.cache_clear()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            a = WhisperSTT(model_size="base", preload=False)
+            b = WhisperSTT(model_size="base", preload=False)
+            assert a._get_model() is b._get_model()
+            WhisperSTT(model_size="tiny", preload=False)._get_model()
+        _load_whisper.cache_clear()
+
+        assert mock_fw.WhisperModel.call_count == 2
+
+    def test_auto_shares_model_with_resolved_type(self):
+        mock_fw = MagicMock()
+        from soul.stt.whisper_stt import WhisperSTT, _load_whisper
+
+        _load_whisper.cache_clear()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}), patch(
+            "soul.stt.whisper_stt._supported_compute_types", return_value={"int8", "float32"}
+        ):
+            auto = WhisperSTT(compute_type="auto", preload=False)._get_model()
+            explicit = WhisperSTT(compute_type="int8", preload=False)._get_model()
+        _load_whisper.cache_clear()
+
+        assert auto is explicit
+        mock_fw.WhisperModel.assert_called_once()
+        assert mock_fw.WhisperModel.call_args.kwargs["compute_type"] == "int8"
+
+    @pytest.mark.parametrize(
+        "device,expected",
+        [("cpu", "int8"), ("cuda", "int8_float16")],
+    )
+    def test_default_model_is_quantized(self, device, expected):
+        """A default WhisperSTT constructs the model with a quantized compute type."""
+        mock_fw = MagicMock()
+        from soul.stt.whisper_stt import WhisperSTT, _load_whisper
+
+        _load_whisper.cache_clear()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}), patch(
+            "soul.stt.whisper_stt._supported_compute_types",
+            return_value={"int8", "int8_float16", "float16", "float32"},
+        ):
+            WhisperSTT(device=device, preload=False)._get_model()
+        _load_whisper.cache_clear()
+
+        kwargs = mock_fw.WhisperModel.call_args.kwargs
+        assert kwargs["device"] == device
+        assert kwargs["compute_type"] == expected
+
+    def test_cpu_threads_sized_to_physical_cores(self):
+        import os
+
+        from soul.stt.whisper_stt import _load_whisper, _physical_cores
+
+        assert 1 <= _physical_cores() <= (os.cpu_count() or 1)
+
+        mock_fw = MagicMock()
+        _load_whisper.cache_clear()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            _load_whisper("base", "cpu", "auto")
+            _load_whisper("base", "cuda", "auto")
+        _load_whisper.cache_clear()
+
+        cpu_kwargs, cuda_kwargs = (c.kwargs for c in mock_fw.WhisperModel.call_args_list)
+        assert 1 <= cpu_kwargs["cpu_threads"] <= 8
+        assert cpu_kwargs["num_workers"] == 1
+        assert "cpu_threads" not in cuda_kwargs
+
+    def test_preload_loads_in_background(self):
+        mock_fw = MagicMock()
+        from soul.stt.whisper_stt import WhisperSTT, _load_whisper
+
+        _load_whisper.cache_clear()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            stt = WhisperSTT(model_size="base")
+            assert stt.is_available() is True
+        _load_whisper.cache_clear()
+
+        assert not stt._preload_thread.is_alive()
+        assert stt._model is mock_fw.WhisperModel.return_value
+        mock_fw.WhisperModel.assert_called_once()
+
+    def test_transcribe_with_mock(self):
+        """Test transcription through a plugged-in model."""
+        from soul.stt.whisper_stt import WhisperSTT
+
+        model = _FakeWhisperModel(
+            [_Segment(" Hello, how are you? ", 0.0, 2.5)], _Info("en", 0.98)
+        )
+        stt = WhisperSTT(model=model)
 
         result = stt.transcribe(b"fake wav data")
         assert result is not None
         assert result.text == "Hello, how are you?"
         assert result.duration == 2.5
+        assert stt._preload_thread is None
+
+        assert len(model.calls) == 1
+        call_kwargs = model.calls[0][1]
+        assert call_kwargs["vad_parameters"] == {
+            "threshold": 0.5,
+            "min_silence_duration_ms": 200,
+            "speech_pad_ms": 100,
+        }
+        assert call_kwargs["language"] == "no"
+        assert call_kwargs["task"] == "transcribe"
+        assert call_kwargs["condition_on_previous_text"] is False
+        assert call_kwargs["beam_size"] == 1
+        assert call_kwargs["best_of"] == 1
+        assert call_kwargs["temperature"] == 0.0
+        # Pinned language skips LID, so confidence does not read it
+        assert result.confidence == 1.0
+
+    def test_transcribe_pcm16_passes_array(self):
+        """Raw PCM input is converted in-process instead of via a file object."""
+        import numpy as np
+
+        from soul.stt.whisper_stt import WhisperSTT
+
+        model = _FakeWhisperModel([_Segment("Hei", 0.0, 0.5)], _Info("no", 1.0))
+        stt = WhisperSTT(audio_format="pcm16_16k", model=model)
+
+        pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+        result = stt.transcribe(pcm)
+
+        audio = model.calls[0][0]
+        assert isinstance(audio, np.ndarray)
+        assert audio.dtype == np.float32
+        assert audio.tolist() == [0.0, 0.5, -1.0]
+        assert result.text == "Hei"
+
+    def test_invalid_audio_format(self):
+        from soul.stt.whisper_stt import WhisperSTT
+
+        with pytest.raises(ValueError):
+            WhisperSTT(audio_format="flac", preload=False)
+
+    def test_transcribe_auto_detect_language(self):
+        from soul.stt.whisper_stt import WhisperSTT
+
+        model = _FakeWhisperModel([_Segment("Hello", 0.0, 1.0)], _Info("en", 0.9))
+        stt = WhisperSTT(language=None, model=model)
+
+        result = stt.transcribe(b"fake wav data")
+        assert model.calls[0][1]["language"] is None
+        assert result.language == "en"
+        assert result.confidence == 0.9
+
+    def test_auto_detect_confidence_inverted_for_non_english(self):
+        from soul.stt.whisper_stt import WhisperSTT
+
+        stt = WhisperSTT(language=None, preload=False)
+        info = MagicMock(language="no", language_probability=0.75)
+        assert stt._confidence(info) == 0.25
+
+    def test_transcribe_skips_blank_segments(self):
+        from soul.stt.whisper_stt import WhisperSTT
+
+        model = _FakeWhisperModel(
+            [
+                _Segment(" Hei ", 0.0, 1.0),
+                _Segment("  ", 1.0, 1.5),
+                _Segment(" på deg ", 1.5, 2.0),
+            ],
+            _Info("no", 1.0),
+        )
+        stt = WhisperSTT(model=model)
+
+        result = stt.transcribe(b"fake wav data")
+        assert result.text == "Hei på deg"
+        assert result.duration == 2.0
 
     def test_transcribe_empty_audio(self):
         """When no speech detected, returns None."""
         from soul.stt.whisper_stt import WhisperSTT
 
-        stt = WhisperSTT()
+        stt = WhisperSTT(model=_FakeWhisperModel([], _Info("en", 0.5)))
+
+        result = stt.transcribe(b"silence")
+        assert result is None
+
+    def test_transcribe_batch(self):
+        """Batched path maps each segment back to its source utterance."""
+        import numpy as np
+
+        from soul.stt.whisper_stt import WhisperSTT
+
+        stt = WhisperSTT(preload=False)
+        stt._model = MagicMock()
+
+        # 1 s, 0 s (empty), and 2 s of audio at 16 kHz
+        decoded = [np.zeros(16000), np.zeros(0), np.zeros(32000)]
+        # VAD: one voiced region in the first, two in the last utterance
+        speech = [
+            [{"start": 1600, "end": 14400}],
+            [{"start": 0, "end": 12800}, {"start": 16000, "end": 32000}],
+        ]
+        segments = [
+            MagicMock(start=0.1, end=0.9, text=" Hei "),
+            MagicMock(start=1.2, end=1.8, text=" Hvor er "),
+            MagicMock(start=2.1, end=2.8, text=" kaffen? "),
+        ]
+        info = MagicMock(language="no", language_probability=0.0)
+
+        mock_fw = MagicMock()
+        mock_fw.decode_audio.side_effect = decoded
+        mock_fw.vad.get_speech_timestamps.side_effect = speech
+        mock_fw.BatchedInferencePipeline.return_value.transcribe.return_value = (
+            segments,
+            info,
+        )
+        modules = {"faster_whisper": mock_fw, "faster_whisper.vad": mock_fw.vad}
+        with patch.dict("sys.modules", modules):
+            results = stt.transcribe_batch([b"a", b"", b"b"])
+
+        assert results[0].text == "Hei"
+        assert results[1] is None
+        assert results[2].text == "Hvor er kaffen?"
+        assert abs(results[2].duration - 1.8) < 1e-6
+
+        vad_kwargs = mock_fw.vad.get_speech_timestamps.call_args[1]
+        assert vad_kwargs["min_silence_duration_ms"] == 200
+        call_kwargs = mock_fw.BatchedInferencePipeline.return_value.transcribe.call_args[1]
+        # The last utterance's two regions share one clip (one encoder window)
+        assert call_kwargs["batch_size"] == 2
+        assert call_kwargs["clip_timestamps"] == [
+            {"start": 0.1, "end": 0.9},
+            {"start": 1.0, "end": 3.0},
+        ]
 
-        mock_info = MagicMock()
-        mock_info.language = "en"
-        mock_info.language_probability = 0.5
+    def test_transcribe_batch_splits_clips_at_window(self):
+        """Regions are merged only up to 30 s per clip; batch size is capped."""
+        import numpy as np
 
+        from soul.stt.whisper_stt import _BATCH_SIZE, WhisperSTT
+
+        stt = WhisperSTT(preload=False)
+        stt._model = MagicMock()
+
+        sr = 16000
+        # One 40 s utterance with speech at 0-10 s, 20-28 s and 35-40 s, plus
+        # ten short utterances
+        decoded = [np.zeros(40 * sr)] + [np.zeros(sr)] * 10
+        speech = [
+            [
+                {"start": 0, "end": 10 * sr},
+                {"start": 20 * sr, "end": 28 * sr},
+                {"start": 35 * sr, "end": 40 * sr},
+            ]
+        ] + [[{"start": 0, "end": sr // 2}]] * 10
+
+        mock_fw = MagicMock()
+        mock_fw.decode_audio.side_effect = decoded
+        mock_fw.vad.get_speech_timestamps.side_effect = speech
+        mock_fw.BatchedInferencePipeline.return_value.transcribe.return_value = (
+            [],
+            MagicMock(language="no", language_probability=0.0),
+        )
+        modules = {"faster_whisper": mock_fw, "faster_whisper.vad": mock_fw.vad}
+        with patch.dict("sys.modules", modules):
+            stt.transcribe_batch([b"long"] + [b"short"] * 10)
+
+        call_kwargs = mock_fw.BatchedInferencePipeline.return_value.transcribe.call_args[1]
+        clips = call_kwargs["clip_timestamps"]
+        assert clips[:2] == [{"start": 0.0, "end": 28.0}, {"start": 35.0, "end": 40.0}]
+        assert len(clips) == 12
+        assert call_kwargs["batch_size"] == _BATCH_SIZE
+
+    def test_transcribe_async_runs_off_loop(self):
+        """transcribe_async delegates to transcribe on the worker thread."""
+        import asyncio
+        import threading
+
+        from soul.stt.whisper_stt import WhisperSTT
+
+        stt = WhisperSTT(preload=False)
+        seen = {}
+
+        def fake_transcribe(audio):
+            seen["thread"] = threading.current_thread().name
+            return Utterance(text="Hei")
+
+        stt.transcribe = fake_transcribe
+        assert stt._pool is None  # no worker until first async call
+        result = asyncio.run(stt.transcribe_async(b"audio"))
+
+        assert result.text == "Hei"
+        assert seen["thread"].startswith("whisper")
+
+        pool = stt._pool
+        stt.close()
+        assert stt._pool is None
+        assert pool._shutdown
+
+    def test_transcribe_stream_windows_and_dedup(self):
+        """Overlapping windows are decoded as they fill; repeated words dropped."""
+        from soul.stt.whisper_stt import WhisperSTT
+
+        stt = WhisperSTT(audio_format="pcm16_16k", preload=False)
         mock_model = MagicMock()
-        mock_model.transcribe.return_value = ([], mock_info)
+        info = MagicMock(language="no", language_probability=1.0)
+        mock_model.transcribe.side_effect = [
+            ([MagicMock(text=" Hei, hvor er")], info),
+            ([MagicMock(text=" er kaffen?")], info),
+        ]
         stt._model = mock_model
 
-        result = stt.transcribe(b"silence")
-        assert result is None
+        chunk = b"\x00\x00" * 12000  # 0.75 s
+        results = list(
+            stt.transcribe_stream([chunk, chunk], window_s=1.0, overlap_s=0.25)
+        )
+
+        assert [u.text for u in results] == ["Hei, hvor er", "kaffen?"]
+        first, second = mock_model.transcribe.call_args_list
+        assert len(first[0][0]) == 16000
+        assert first[1]["initial_prompt"] is None
+        # Tail = 0.25 s overlap + 0.5 s not yet decoded
+        assert len(second[0][0]) == 12000
+        assert second[1]["initial_prompt"] == "Hei, hvor er"
+
+    def test_transcribe_stream_requires_pcm(self):
+        from soul.stt.whisper_stt import WhisperSTT
+
+        stt = WhisperSTT(preload=False)
+        with pytest.raises(ValueError):
+            list(stt.transcribe_stream([b"audio"]))
+
+    def test_transcribe_batch_empty(self):
+        from soul.stt.whisper_stt import WhisperSTT
+
+        assert WhisperSTT(preload=False).transcribe_batch([]) == []